@@ -0,0 +1,197 @@
+"""
+Response cache with stale-while-revalidate for read-heavy endpoints
+
+Backed by Redis when REDIS_URL is configured, otherwise an in-process
+dict. A fresh hit skips the database entirely; a stale hit (within the
+SWR window) returns immediately while a background task refreshes the
+entry, so readers never wait on the refresh.
+"""
+import asyncio
+import functools
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# Optional Redis backend — the in-process cache works without it
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+CACHE_SWR_SECONDS = int(os.getenv("CACHE_SWR_SECONDS", "60"))
+
+# A configured Redis that can't be reached is a deployment bug, not a
+# degradation to paper over: multi-worker deploys rely on the shared
+# backend (background-job polling breaks on the per-process fallback)
+if REDIS_URL and not REDIS_AVAILABLE:
+    logger.error(
+        "❌ REDIS_URL is set but the redis package is not installed — "
+        "falling back to the per-process cache; background-job polling "
+        "will misbehave under multiple workers"
+    )
+
+_redis = None
+_redis_failed = False
+
+# In-process fallback: key -> (value, fresh_until, evict_at)
+_local: Dict[str, Tuple[Any, float, float]] = {}
+# Keys with a background refresh already in flight
+_refreshing: set = set()
+
+
+def _get_redis():
+    """Lazily connect to Redis; fall back to the local cache on failure"""
+    global _redis, _redis_failed
+    if _redis is None and not _redis_failed and REDIS_AVAILABLE and REDIS_URL:
+        try:
+            _redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+            logger.info("✅ Redis cache connected")
+        except Exception as e:
+            _redis_failed = True
+            logger.error(
+                f"❌ REDIS_URL is set but Redis is unreachable, using the "
+                f"per-process cache (breaks job polling under multiple "
+                f"workers): {e}"
+            )
+    return _redis
+
+
+def _make_key(name: str, args: tuple, kwargs: dict) -> str:
+    parts = [name] + [str(a) for a in args]
+    parts += [f"{k}={kwargs[k]}" for k in sorted(kwargs)]
+    return ":".join(parts)
+
+
+async def _cache_get(key: str) -> Optional[Tuple[Any, float]]:
+    """Return (value, fresh_until) or None"""
+    redis = _get_redis()
+    if redis is not None:
+        try:
+            raw = await redis.get(key)
+            if raw is not None:
+                entry = json.loads(raw)
+                return entry["value"], entry["fresh_until"]
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Redis GET failed: {e}")
+
+    entry = _local.get(key)
+    if entry is None:
+        return None
+    value, fresh_until, evict_at = entry
+    if time.time() >= evict_at:
+        _local.pop(key, None)
+        return None
+    return value, fresh_until
+
+
+async def _cache_set(key: str, value: Any, ttl: int, swr: int):
+    now = time.time()
+    redis = _get_redis()
+    if redis is not None:
+        try:
+            payload = json.dumps(
+                {"value": value, "fresh_until": now + ttl}, default=str
+            )
+            # Keep the entry around for the SWR window past freshness
+            await redis.setex(key, ttl + swr, payload)
+            return
+        except Exception as e:
+            logger.warning(f"⚠️ Redis SETEX failed: {e}")
+
+    _local[key] = (value, now + ttl, now + ttl + swr)
+    # Opportunistic eviction so the dict doesn't grow unbounded
+    if len(_local) > 1024:
+        for stale_key in [k for k, v in _local.items() if v[2] <= now]:
+            _local.pop(stale_key, None)
+
+
+def _schedule_refresh(key: str, func, args, kwargs, ttl: int, swr: int):
+    """Refresh a stale entry in the background (one task per key)"""
+    if key in _refreshing:
+        return
+
+    _refreshing.add(key)
+
+    async def _refresh():
+        try:
+            value = await func(*args, **kwargs)
+            await _cache_set(key, value, ttl, swr)
+        except Exception as e:
+            logger.warning(f"⚠️ Cache refresh failed for {key}: {e}")
+        finally:
+            _refreshing.discard(key)
+
+    asyncio.create_task(_refresh())
+
+
+def cached(ttl: int = None, swr: int = None):
+    """Cache an async handler's result keyed by its arguments
+
+    Fresh entries are served directly; entries inside the SWR window are
+    served stale while a background task re-runs the handler. Errors are
+    never cached.
+    """
+    ttl = CACHE_TTL_SECONDS if ttl is None else ttl
+    swr = CACHE_SWR_SECONDS if swr is None else swr
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = _make_key(func.__name__, args, kwargs)
+            entry = await _cache_get(key)
+
+            if entry is not None:
+                value, fresh_until = entry
+                now = time.time()
+                if now < fresh_until:
+                    return value
+                if now < fresh_until + swr:
+                    _schedule_refresh(key, func, args, kwargs, ttl, swr)
+                    return value
+
+            value = await func(*args, **kwargs)
+            await _cache_set(key, value, ttl, swr)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+async def cache_get(key: str) -> Any:
+    """Direct lookup for callers managing their own keys
+
+    Returns the stored value (stale entries included) or None. Shared
+    across workers when Redis is configured.
+    """
+    entry = await _cache_get(key)
+    return entry[0] if entry is not None else None
+
+
+async def cache_set(key: str, value: Any, ttl: int):
+    """Direct store for callers managing their own keys (no SWR window)"""
+    await _cache_set(key, value, ttl, 0)
+
+
+async def invalidate_prefix(prefix: str):
+    """Drop all cached entries whose key starts with prefix"""
+    redis = _get_redis()
+    if redis is not None:
+        try:
+            async for key in redis.scan_iter(match=f"{prefix}*"):
+                await redis.delete(key)
+            return
+        except Exception as e:
+            logger.warning(f"⚠️ Redis invalidation failed: {e}")
+
+    for key in [k for k in _local if k.startswith(prefix)]:
+        _local.pop(key, None)
@@ -0,0 +1,15 @@
+"""
+Application configuration flags
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Demo mode (default on): endpoints return generated sample data when a
+# table is empty or the database is unreachable, so the frontend always
+# has something to render. Set TERRAGUARD_DEMO_MODE=0 in production —
+# outages then surface as 503s instead of silently serving fake data
+# (and skip the cost of generating it on every DB hiccup).
+DEMO_MODE = os.getenv("TERRAGUARD_DEMO_MODE", "1").lower() not in ("0", "false", "no")
@@ -1,40 +1,206 @@
 """
 Database connection and configuration using Supabase
 """
+import asyncio
+import logging
 import os
+import threading
 from typing import Optional
+import httpx
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
 from dotenv import load_dotenv
 
+# asyncpg is optional: with a direct DSN configured the routes run SQL
+# over a pool of persistent connections instead of per-request HTTPS
+# calls to PostgREST
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    asyncpg = None
+    ASYNCPG_AVAILABLE = False
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Supabase configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_KEY", "")
+
+# Connection pool settings (tunable via .env)
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "100"))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "50"))
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "60"))
+SUPABASE_TIMEOUT = int(os.getenv("SUPABASE_TIMEOUT", "30"))
+
 # Global client instance
 _supabase_client: Optional[Client] = None
+# Guards client construction so racing threads can't each pay for a
+# create_client (TLS handshake + connection pool)
+_client_lock = threading.Lock()
+
+
+def _build_client_options() -> ClientOptions:
+    """Build client options with a sized connection pool and keep-alive
+
+    Reusing pooled TCP/TLS connections avoids a fresh handshake per
+    request burst against PostgREST.
+    """
+    options = ClientOptions(
+        postgrest_client_timeout=SUPABASE_TIMEOUT,
+        storage_client_timeout=SUPABASE_TIMEOUT,
+    )
+
+    pooled_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+            keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY,
+        )
+    )
+
+    # Older supabase-py releases don't accept a custom httpx client;
+    # fall back to default transport but keep the timeouts
+    if hasattr(options, "httpx_client"):
+        options.httpx_client = pooled_client
+    else:
+        pooled_client.close()
+
+    return options
 
 
 def get_supabase_client() -> Client:
-    """Get or create Supabase client instance"""
+    """Get or create Supabase client instance (thread-safe)"""
     global _supabase_client
-    
+
+    # Double-checked locking: the common path stays lock-free
     if _supabase_client is None:
-        if not SUPABASE_URL or not SUPABASE_ANON_KEY:
-            print("⚠️  WARNING: Supabase credentials not configured!")
-            print("⚠️  Set SUPABASE_URL and SUPABASE_ANON_KEY in .env")
-            # Return None instead of raising error for graceful degradation
-            return None
-        
-        try:
-            _supabase_client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-            print("✅ Supabase connected successfully")
-        except Exception as e:
-            print(f"❌ Supabase connection error: {e}")
-            return None
-    
+        with _client_lock:
+            if _supabase_client is None:
+                if not SUPABASE_URL or not SUPABASE_ANON_KEY:
+                    logger.warning("⚠️ Supabase credentials not configured!")
+                    logger.warning("⚠️ Set SUPABASE_URL and SUPABASE_ANON_KEY in .env")
+                    # Return None instead of raising error for graceful degradation
+                    return None
+
+                try:
+                    _supabase_client = create_client(
+                        SUPABASE_URL, SUPABASE_ANON_KEY, options=_build_client_options()
+                    )
+                    logger.info("✅ Supabase connected successfully")
+                except Exception as e:
+                    logger.error(f"❌ Supabase connection error: {e}")
+                    return None
+
     return _supabase_client
 
 
-# Initialize on module import
-supabase = get_supabase_client()
\ No newline at end of file
+def get_db() -> Optional[Client]:
+    """FastAPI dependency: the shared Supabase client"""
+    return get_supabase_client()
+
+
+# ----------------------------
+# ASYNCPG POOL
+# ----------------------------
+# Direct Postgres DSN (Supabase -> Settings -> Database). Optional: when
+# unset, everything stays on the PostgREST client.
+SUPABASE_DB_URL = os.getenv("SUPABASE_DB_URL")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "5"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+
+_db_pool = None
+_db_pool_failed = False
+_db_pool_lock: Optional[asyncio.Lock] = None
+
+
+def _dsn_is_transaction_pooled(dsn: str) -> bool:
+    """True when the DSN goes through a transaction-mode pooler
+
+    Server-side prepared statements don't survive transaction pooling
+    (Supabase's PgBouncer/Supavisor on port 6543), so asyncpg's
+    statement cache must be disabled on such DSNs. Set
+    SUPABASE_DB_POOLED=1 for a pooler on a non-standard port.
+    """
+    if os.getenv("SUPABASE_DB_POOLED"):
+        return True
+    return bool(dsn) and ":6543" in dsn
+
+
+async def get_db_pool():
+    """Get or lazily create the shared asyncpg pool
+
+    Returns None when no DSN is configured, asyncpg is missing, or pool
+    creation failed — callers fall back to the PostgREST client.
+    """
+    global _db_pool, _db_pool_failed, _db_pool_lock
+
+    if _db_pool is not None:
+        return _db_pool
+    if _db_pool_failed or not (ASYNCPG_AVAILABLE and SUPABASE_DB_URL):
+        return None
+
+    if _db_pool_lock is None:
+        _db_pool_lock = asyncio.Lock()
+
+    async with _db_pool_lock:
+        if _db_pool is None and not _db_pool_failed:
+            try:
+                _db_pool = await asyncpg.create_pool(
+                    dsn=SUPABASE_DB_URL,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    command_timeout=30,
+                    statement_cache_size=(
+                        0 if _dsn_is_transaction_pooled(SUPABASE_DB_URL) else 256
+                    ),
+                )
+                logger.info(
+                    "✅ asyncpg pool ready (min=%d, max=%d)",
+                    DB_POOL_MIN_SIZE,
+                    DB_POOL_MAX_SIZE,
+                )
+            except Exception as e:
+                _db_pool_failed = True
+                logger.warning("⚠️ asyncpg pool unavailable, using PostgREST: %s", e)
+
+    return _db_pool
+
+
+async def close_db_pool():
+    """Close the pool on application shutdown"""
+    global _db_pool
+    if _db_pool is not None:
+        await _db_pool.close()
+        _db_pool = None
+
+
+async def pool_fetch(sql: str, *args):
+    """Run a read query on the asyncpg pool, returning plain dict rows
+
+    Returns None when the pool is not available or the query fails so
+    callers can fall back to the PostgREST client.
+    """
+    pool = await get_db_pool()
+    if pool is None:
+        return None
+    try:
+        async with pool.acquire() as con:
+            rows = await con.fetch(sql, *args)
+        return [dict(row) for row in rows]
+    except Exception as e:
+        logger.warning("⚠️ Pooled query failed, falling back to PostgREST: %s", e)
+        return None
+
+
+def __getattr__(name: str):
+    """Lazily resolve `database.supabase` (PEP 562)
+
+    Keeps `from app.database import supabase` working without paying
+    for client construction at worker/test startup.
+    """
+    if name == "supabase":
+        return get_supabase_client()
+    raise AttributeError(name)
\ No newline at end of file
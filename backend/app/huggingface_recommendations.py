@@ -4,42 +4,486 @@ Generates land management recommendations using AI models
 """
 
 import os
+import asyncio
+import copy
+import functools
 import logging
-from typing import List, Dict, Any, Optional
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import json
 
 logger = logging.getLogger(__name__)
 
+# Prefer orjson (C-accelerated) for parsing LLM output, fall back to stdlib
+try:
+    import orjson
+
+    def _json_loads(json_str: str):
+        return orjson.loads(json_str)
+except ImportError:
+    def _json_loads(json_str: str):
+        return json.loads(json_str)
+
+# Matches the outermost JSON array in one pass instead of find/rfind scans
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
 # Try to import HuggingFace Hub
 try:
-    from huggingface_hub import InferenceClient
+    from huggingface_hub import AsyncInferenceClient
     HF_AVAILABLE = True
 except ImportError:
     HF_AVAILABLE = False
     logger.warning("⚠️ huggingface_hub not installed. Install with: pip install huggingface_hub")
 
 
+@dataclass(slots=True)
+class InputView:
+    """
+    Normalized view over the raw location/risk/health/forecast dicts
+
+    Resolves the key fallbacks (vegetation_cover_pct → vegetation_cover,
+    temp_avg → temperature) once, so prompt building, caching, and the
+    rule-based fallback don't repeat dict.get chains per call.
+    """
+
+    location_name: str
+    risk_score: float
+    risk_level: str
+    ndvi: float
+    veg_cover: float
+    avg_temp: float
+    total_precip: float
+    drought_risk: float
+    erosion_risk: float
+    soil_degradation_risk: float
+    vegetation_loss_risk: float
+
+    @classmethod
+    def from_raw(
+        cls,
+        location_data: Dict[str, Any],
+        risk_assessment: Dict[str, Any],
+        land_health: Dict[str, Any],
+        climate_forecast: List[Dict[str, Any]]
+    ) -> "InputView":
+        """Normalize the raw input dicts into a flat view"""
+
+        avg_temp = 0.0
+        total_precip = 0.0
+        if climate_forecast and len(climate_forecast) >= 16:
+            # Monthly/yearly windows: let NumPy do the reductions at C speed
+            import numpy as np
+
+            arr = np.fromiter(
+                (
+                    (
+                        f.get("temp_avg", f.get("temperature", 0)),
+                        f.get("precipitation", f.get("rainfall", 0)),
+                    )
+                    for f in climate_forecast
+                ),
+                dtype=np.dtype([("t", "f4"), ("p", "f4")]),
+                count=len(climate_forecast),
+            )
+            avg_temp = float(arr["t"].mean()) if arr.size else 0.0
+            total_precip = float(arr["p"].sum())
+        elif climate_forecast:
+            # Short forecasts: plain Python beats the NumPy import/convert cost
+            temps = [f.get("temp_avg", f.get("temperature", 0)) for f in climate_forecast]
+            precips = [f.get("precipitation", f.get("rainfall", 0)) for f in climate_forecast]
+            avg_temp = sum(temps) / len(temps) if temps else 0.0
+            total_precip = sum(precips) if precips else 0.0
+
+        return cls(
+            location_name=location_data.get("name", "Unknown Location"),
+            risk_score=risk_assessment.get("total_risk_score", 50),
+            risk_level=risk_assessment.get("risk_level", "MEDIUM"),
+            ndvi=land_health.get("ndvi", 0.5) or 0.0,
+            veg_cover=land_health.get("vegetation_cover_pct", land_health.get("vegetation_cover", 50)) or 0.0,
+            avg_temp=avg_temp,
+            total_precip=total_precip,
+            drought_risk=risk_assessment.get("drought_risk", 0),
+            erosion_risk=risk_assessment.get("erosion_risk", 0),
+            soil_degradation_risk=risk_assessment.get("soil_degradation_risk", 0),
+            vegetation_loss_risk=risk_assessment.get("vegetation_loss_risk", 0),
+        )
+
+
+# JSON schema mirroring the cleaned-recommendation shape; passed as a TGI
+# grammar so the model physically cannot emit invalid JSON
+_RECOMMENDATION_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "priority": {"type": "string", "enum": ["high", "medium", "low"]},
+        "category": {
+            "type": "string",
+            "enum": ["restoration", "irrigation", "soil_management", "vegetation", "monitoring"]
+        },
+        "action_title": {"type": "string", "maxLength": 100},
+        "action_description": {"type": "string", "maxLength": 500},
+        "urgency_hours": {"type": "integer"},
+        "expected_risk_reduction": {"type": "number"}
+    },
+    "required": ["priority", "category", "action_title", "action_description"]
+}
+
+_RECOMMENDATIONS_SCHEMA = {
+    "type": "array",
+    "items": _RECOMMENDATION_ITEM_SCHEMA,
+    "minItems": 1,
+    "maxItems": 3
+}
+
+_BATCH_RECOMMENDATIONS_SCHEMA = {
+    "type": "array",
+    "items": _RECOMMENDATIONS_SCHEMA
+}
+
+
+# Rule-based recommendation table: (predicate, template) pairs evaluated
+# in order. Templates are frozen literals copied per match instead of
+# rebuilt dicts; predicates use InputView attribute access
+_RULES = (
+    # High risk - urgent intervention needed
+    (
+        lambda v: v.risk_score >= 70 or v.risk_level == "CRITICAL",
+        {
+            "priority": "high",
+            "category": "restoration",
+            "action_title": "Urgent: Implement soil conservation measures",
+            "action_description": "High degradation risk detected. Immediately establish contour bunds, plant cover crops, and restrict grazing to prevent further degradation.",
+            "urgency_hours": 72,
+            "expected_risk_reduction": 25.0,
+            "expected_cost_usd": 500,
+            "recommended_species": None
+        },
+    ),
+    # Low vegetation - restoration needed
+    (
+        lambda v: v.ndvi < 0.3 or v.veg_cover < 30,
+        {
+            "priority": "high",
+            "category": "vegetation",
+            "action_title": "Restore vegetation cover",
+            "action_description": "Low vegetation detected (NDVI: {ndvi:.2f}). Plant native grass species and fast-growing trees. Consider agroforestry with Acacia or Moringa species.",
+            "urgency_hours": 168,
+            "expected_risk_reduction": 20.0,
+            "expected_cost_usd": 300,
+            "recommended_species": [
+                {"name": "Acacia senegal", "type": "tree"},
+                {"name": "Vetiver grass", "type": "grass"}
+            ]
+        },
+    ),
+    # High drought risk - water conservation
+    (
+        lambda v: v.drought_risk > 5,
+        {
+            "priority": "high",
+            "category": "irrigation",
+            "action_title": "Implement water conservation techniques",
+            "action_description": "High drought risk detected. Install rainwater harvesting systems, apply mulching, and consider drip irrigation for critical crops.",
+            "urgency_hours": 120,
+            "expected_risk_reduction": 18.0,
+            "expected_cost_usd": 400,
+            "recommended_species": None
+        },
+    ),
+    # High erosion risk - soil management
+    (
+        lambda v: v.erosion_risk > 5,
+        {
+            "priority": "high",
+            "category": "soil_management",
+            "action_title": "Prevent soil erosion",
+            "action_description": "High erosion risk detected. Establish terracing on slopes, plant windbreaks, and use cover crops to protect soil. Avoid bare soil during rainy season.",
+            "urgency_hours": 96,
+            "expected_risk_reduction": 22.0,
+            "expected_cost_usd": 450,
+            "recommended_species": [
+                {"name": "Leucaena leucocephala", "type": "tree"},
+                {"name": "Napier grass", "type": "grass"}
+            ]
+        },
+    ),
+    # Moderate risk - regular monitoring
+    (
+        lambda v: 40 <= v.risk_score < 70,
+        {
+            "priority": "medium",
+            "category": "monitoring",
+            "action_title": "Establish regular monitoring routine",
+            "action_description": "Moderate risk level detected. Set up monthly soil and vegetation monitoring. Track rainfall and adjust management practices accordingly.",
+            "urgency_hours": 168,
+            "expected_risk_reduction": 15.0,
+            "expected_cost_usd": 100,
+            "recommended_species": None
+        },
+    ),
+    # Low risk - maintenance
+    (
+        lambda v: v.risk_score < 40,
+        {
+            "priority": "low",
+            "category": "monitoring",
+            "action_title": "Maintain current good practices",
+            "action_description": "Land is in relatively good condition. Continue current management practices and monitor for any changes. Consider introducing nitrogen-fixing plants to improve soil fertility.",
+            "urgency_hours": 336,
+            "expected_risk_reduction": 10.0,
+            "expected_cost_usd": 50,
+            "recommended_species": [
+                {"name": "Sesbania sesban", "type": "tree"},
+                {"name": "Cowpea", "type": "crop"}
+            ]
+        },
+    ),
+)
+
+# Emitted when no rule matches, so callers always get something actionable
+_DEFAULT_RULE = {
+    "priority": "medium",
+    "category": "general",
+    "action_title": "Conduct comprehensive land assessment",
+    "action_description": "Perform detailed soil testing, vegetation survey, and water availability assessment to develop targeted management plan.",
+    "urgency_hours": 168,
+    "expected_risk_reduction": 12.0,
+    "expected_cost_usd": 200,
+    "recommended_species": None
+}
+
+
+def _fill_rule(template: Dict[str, Any], view: "InputView") -> Dict[str, Any]:
+    """Copy a rule template, substituting view values into its description"""
+    rec = copy.deepcopy(template)
+    if "{" in rec["action_description"]:
+        rec["action_description"] = rec["action_description"].format(ndvi=view.ndvi)
+    return rec
+
+
+@functools.lru_cache(maxsize=4096)
+def _rules_for(bucket_key: tuple) -> Tuple[Dict[str, Any], ...]:
+    """
+    Evaluate the rule table for a quantized input bucket
+
+    Memoized: batch scans where thousands of plots share risk brackets
+    reduce to one table walk per unique bracket. Callers must copy the
+    returned recommendations before handing them out.
+    """
+    risk_score, risk_level, ndvi, veg_cover, drought_high, erosion_high = bucket_key
+
+    probe = InputView(
+        location_name="",
+        risk_score=risk_score,
+        risk_level=risk_level,
+        ndvi=ndvi,
+        veg_cover=veg_cover,
+        avg_temp=0.0,
+        total_precip=0.0,
+        drought_risk=6.0 if drought_high else 0.0,
+        erosion_risk=6.0 if erosion_high else 0.0,
+        soil_degradation_risk=0.0,
+        vegetation_loss_risk=0.0,
+    )
+
+    recommendations = [
+        _fill_rule(template, probe)
+        for predicate, template in _RULES
+        if predicate(probe)
+    ]
+
+    # Ensure we always return at least one recommendation
+    if not recommendations:
+        recommendations.append(_fill_rule(_DEFAULT_RULE, probe))
+
+    # Limit to top 3 recommendations
+    return tuple(recommendations[:3])
+
+
+def _scan_complete_objects(buffer: str, start: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Incrementally extract completed top-level JSON objects from a
+    partially streamed array
+
+    Returns the parsed objects found after `start` and the offset to
+    resume scanning from on the next token.
+    """
+    objects = []
+    depth = 0
+    in_string = False
+    escaped = False
+    obj_start = -1
+    i = start
+
+    while i < len(buffer):
+        ch = buffer[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            if depth == 0:
+                obj_start = i
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0 and obj_start != -1:
+                try:
+                    objects.append(_json_loads(buffer[obj_start:i + 1]))
+                except ValueError:
+                    pass
+                obj_start = -1
+                start = i + 1
+        i += 1
+
+    return objects, start
+
+
+class _BatchQueue:
+    """
+    Coalesce concurrent single-location calls into shared batch prompts
+
+    Callers submit an InputView and await their own future; a drainer
+    task buffers submissions for up to max_wait_ms (or batch_size
+    items), fires one batched HF call, and resolves each caller with
+    its slice of the response - the DataLoader buffer-and-flush pattern.
+    """
+
+    def __init__(self, service: "HuggingFaceRecommendationService", batch_size: int, max_wait_ms: int):
+        self._service = service
+        self._batch_size = batch_size
+        self._max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._drainer: Optional[asyncio.Task] = None
+
+    async def submit(self, view: "InputView") -> List[Dict[str, Any]]:
+        """Enqueue one view and wait for its recommendations"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((view, future))
+
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.ensure_future(self._drain())
+
+        return await future
+
+    async def _drain(self):
+        """Flush queued submissions in batches until the queue is empty"""
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            deadline = time.monotonic() + self._max_wait
+
+            # Hold the window open briefly so concurrent callers coalesce
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            views = [view for view, _ in batch]
+            try:
+                results = await self._service._generate_for_views(views)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), recommendations in zip(batch, results):
+                if not future.done():
+                    future.set_result(recommendations)
+
+
+# Static instruction block kept verbatim at the top of every prompt so
+# HF Inference endpoints with prefix caching (TGI/vLLM) can reuse the
+# cached KV for the shared prefix; only the small DATA tail varies
+_SYSTEM_PREFIX = """You are an expert land management consultant specializing in land degradation prevention and restoration in Africa. Analyze the data provided after DATA: and provide 2-3 specific, actionable recommendations.
+
+Provide the recommendations in the following JSON format only, no other text:
+[
+  {
+    "priority": "high|medium|low",
+    "category": "restoration|irrigation|soil_management|vegetation|monitoring",
+    "action_title": "Brief title (max 50 chars)",
+    "action_description": "Detailed action plan (max 200 chars)",
+    "urgency_hours": 168,
+    "expected_risk_reduction": 15.5
+  }
+]
+
+Focus on practical, cost-effective actions suitable for African smallholder farmers."""
+
+# Full single-location prompt: the frozen prefix plus one %s slot for
+# the short per-request data block (%-style because the prefix itself
+# contains literal JSON braces)
+_PROMPT_TEMPLATE = _SYSTEM_PREFIX + """
+
+DATA:
+%s
+
+OUTPUT:"""
+
+
 class HuggingFaceRecommendationService:
     """
     Service for generating AI-powered land management recommendations
     using HuggingFace Inference API
     """
     
-    def __init__(self, model: str = "mistralai/Mistral-7B-Instruct-v0.2"):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        small_model: str = "Qwen/Qwen2.5-1.5B-Instruct",
+        large_model: str = "mistralai/Mistral-7B-Instruct-v0.2"
+    ):
         """
         Initialize the HuggingFace recommendation service
-        
+
         Args:
-            model: HuggingFace model to use for generation
-                   Popular options:
-                   - mistralai/Mistral-7B-Instruct-v0.2 (default, good balance)
+            model: Pin every call to this model instead of the tiered
+                   small/large routing. Popular options:
+                   - mistralai/Mistral-7B-Instruct-v0.2 (good balance)
                    - mistralai/Mixtral-8x7B-Instruct-v0.1 (higher quality, slower)
                    - meta-llama/Llama-2-7b-chat-hf (good alternative)
                    - google/flan-t5-xxl (faster, structured output)
+            small_model: Default for the schema-bounded JSON task; a 1-3B
+                   instruct model answers it at a fraction of 7B cost
+            large_model: Escalation target when the small model's output
+                   fails validation
         """
-        self.model = model
+        self.small_model = small_model
+        self.large_model = large_model
+        # An explicitly requested model disables tiered routing
+        self._model_pinned = model is not None
+        self.model = model or small_model
         self.client = None
-        
+        # Cap concurrent HF API calls to respect rate limits (HF_MAX_CONCURRENCY in .env)
+        self.max_concurrency = int(os.getenv("HF_MAX_CONCURRENCY", "5"))
+        # Locations folded into one batch prompt; keep small so the JSON
+        # answer for every case fits within max_new_tokens
+        self.batch_prompt_size = min(int(os.getenv("HF_BATCH_PROMPT_SIZE", "5")), 8)
+        # TTL cache of LLM responses keyed on bucketed input features, so
+        # near-identical risk/NDVI profiles reuse one HF call
+        self.cache_ttl_seconds = int(os.getenv("HF_CACHE_TTL_SECONDS", "900"))
+        self._cache_maxsize = 1024
+        self._response_cache: Dict[tuple, Tuple[float, List[Dict[str, Any]]]] = {}
+        # Flipped off on the first TypeError from an endpoint/client
+        # without TGI grammar support
+        self._grammar_supported = True
+        # Micro-batching window coalescing concurrent callers into one
+        # batch prompt; set HF_MICROBATCH_WAIT_MS=0 to disable
+        self.microbatch_wait_ms = int(os.getenv("HF_MICROBATCH_WAIT_MS", "30"))
+        self._batch_queue: Optional[_BatchQueue] = None
+
         if not HF_AVAILABLE:
             logger.warning("⚠️ HuggingFace Hub not available. Recommendations will use rule-based fallback.")
             return
@@ -53,13 +497,13 @@ class HuggingFaceRecommendationService:
             return
         
         try:
-            self.client = InferenceClient(token=hf_token)
-            logger.info(f"✅ HuggingFace client initialized with model: {model}")
+            self.client = AsyncInferenceClient(token=hf_token)
+            logger.info(f"✅ HuggingFace client initialized with model: {self.model}")
         except Exception as e:
             logger.error(f"❌ Failed to initialize HuggingFace client: {e}")
             self.client = None
     
-    def generate_recommendations(
+    async def generate_recommendations(
         self,
         location_data: Dict[str, Any],
         risk_assessment: Dict[str, Any],
@@ -68,6 +512,9 @@ class HuggingFaceRecommendationService:
     ) -> List[Dict[str, Any]]:
         """
         Generate AI-powered recommendations based on location data
+
+        Runs as a coroutine so the HuggingFace API call does not block
+        the FastAPI event loop while waiting on the network.
         
         Args:
             location_data: Location information (name, coordinates, etc.)
@@ -79,285 +526,506 @@ class HuggingFaceRecommendationService:
             List of recommendation dictionaries
         """
         
+        # Normalize raw dicts once; downstream methods work on the view
+        view = InputView.from_raw(location_data, risk_assessment, land_health, climate_forecast)
+
         # If AI is not available, use rule-based fallback
         if not self.client:
             logger.info("📋 Using rule-based recommendations (AI not available)")
-            return self._generate_rule_based_recommendations(
-                location_data, risk_assessment, land_health, climate_forecast
-            )
-        
+            return self._generate_rule_based_recommendations(view)
+
+        # Reuse a recent answer for near-identical input profiles
+        cache_key = self._cache_key(view)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("♻️ Returning cached AI recommendations")
+            return cached
+
         try:
-            # Build context for AI
-            prompt = self._build_prompt(location_data, risk_assessment, land_health, climate_forecast)
-            
+            # Coalesce concurrent callers into shared batch prompts
+            if self.microbatch_wait_ms > 0:
+                if self._batch_queue is None:
+                    self._batch_queue = _BatchQueue(
+                        self, self.batch_prompt_size, self.microbatch_wait_ms
+                    )
+                recommendations = await self._batch_queue.submit(view)
+                self._cache_put(cache_key, recommendations)
+                return recommendations
+
+            # Direct path (micro-batching disabled)
+            prompt = self._build_prompt(view)
+
             logger.info(f"🤖 Generating AI recommendations using {self.model}")
             logger.debug(f"Prompt: {prompt[:200]}...")
-            
-            # Call HuggingFace Inference API
-            response = self.client.text_generation(
-                prompt,
-                model=self.model,
-                max_new_tokens=800,
-                temperature=0.7,
-                top_p=0.95,
-                repetition_penalty=1.1,
-                do_sample=True
-            )
-            
+
+            # Call HuggingFace Inference API (with backoff on transient errors)
+            response = await self._call_with_retry(prompt, schema=_RECOMMENDATIONS_SCHEMA)
+
             logger.info("✅ Received AI response")
             logger.debug(f"Raw response: {response[:200]}...")
-            
+
             # Parse AI response into structured recommendations
-            recommendations = self._parse_ai_response(response, risk_assessment)
-            
+            recommendations = self._parse_ai_response(response)
+
+            # Escalate once to the large model before giving up on AI
+            if not recommendations and not self._model_pinned:
+                logger.warning(f"⚠️ {self.model} output failed validation, escalating to {self.large_model}")
+                response = await self._call_with_retry(
+                    prompt, schema=_RECOMMENDATIONS_SCHEMA, model=self.large_model
+                )
+                recommendations = self._parse_ai_response(response)
+
             if not recommendations or len(recommendations) == 0:
                 logger.warning("⚠️ AI generated no valid recommendations, falling back to rule-based")
-                return self._generate_rule_based_recommendations(
-                    location_data, risk_assessment, land_health, climate_forecast
-                )
-            
+                return self._generate_rule_based_recommendations(view)
+
             logger.info(f"✅ Generated {len(recommendations)} AI-powered recommendations")
+            self._cache_put(cache_key, recommendations)
             return recommendations
-            
+
         except Exception as e:
             logger.error(f"❌ Error generating AI recommendations: {e}")
             logger.exception("Full traceback:")
             logger.info("📋 Falling back to rule-based recommendations")
-            return self._generate_rule_based_recommendations(
-                location_data, risk_assessment, land_health, climate_forecast
-            )
+            return self._generate_rule_based_recommendations(view)
     
-    def _build_prompt(
+    async def generate_recommendations_stream(
         self,
         location_data: Dict[str, Any],
         risk_assessment: Dict[str, Any],
         land_health: Dict[str, Any],
         climate_forecast: List[Dict[str, Any]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield recommendations one by one as the model generates them
+
+        Streams tokens from the HF endpoint and emits each
+        recommendation as soon as its JSON object closes, so the first
+        result arrives after ~one object's worth of decode time instead
+        of the full response window.
+        """
+        view = InputView.from_raw(location_data, risk_assessment, land_health, climate_forecast)
+
+        if not self.client:
+            logger.info("📋 Using rule-based recommendations (AI not available)")
+            for rec in self._generate_rule_based_recommendations(view):
+                yield rec
+            return
+
+        buffer = ""
+        scan_from = 0
+        emitted = 0
+        try:
+            stream = await self.client.text_generation(
+                self._build_prompt(view),
+                model=self.model,
+                max_new_tokens=self._estimate_max_new_tokens(3),
+                temperature=0.7,
+                top_p=0.95,
+                repetition_penalty=1.1,
+                do_sample=True,
+                stream=True
+            )
+            async for token in stream:
+                buffer += token
+                objects, scan_from = _scan_complete_objects(buffer, scan_from)
+                for obj in objects:
+                    for rec in self._clean_recommendations([obj]):
+                        emitted += 1
+                        yield rec
+        except Exception as e:
+            logger.error(f"❌ Error streaming AI recommendations: {e}")
+
+        if emitted == 0:
+            logger.info("📋 Falling back to rule-based recommendations")
+            for rec in self._generate_rule_based_recommendations(view):
+                yield rec
+
+    @staticmethod
+    def _estimate_max_new_tokens(num_recs: int) -> int:
+        """
+        Budget output tokens from the expected JSON size
+
+        A recommendation object is ~90 tokens plus array overhead;
+        decode time is linear in output tokens, so requesting more than
+        the answer needs wastes wall time proportionally. The safety cap
+        scales with the number of cases (3 recs each) so batch prompts
+        aren't truncated mid-array.
+        """
+        num_cases = max(1, -(-num_recs // 3))
+        return min(800 * num_cases, 90 * num_recs + 40)
+
+    async def _call_with_retry(
+        self,
+        prompt: str,
+        max_retries: int = 4,
+        schema: Optional[Dict[str, Any]] = None,
+        num_recs: int = 3,
+        stop_sequences: Optional[List[str]] = None,
+        model: Optional[str] = None
     ) -> str:
-        """Build AI prompt from input data"""
-        
-        location_name = location_data.get("name", "Unknown Location")
-        risk_level = risk_assessment.get("risk_level", "UNKNOWN")
-        risk_score = risk_assessment.get("total_risk_score", 0)
-        ndvi = land_health.get("ndvi", 0)
-        veg_cover = land_health.get("vegetation_cover_pct", land_health.get("vegetation_cover", 0))
-        
-        # Calculate average temperature from forecast
-        avg_temp = 0
-        total_precip = 0
-        if climate_forecast:
-            temps = [f.get("temp_avg", f.get("temperature", 0)) for f in climate_forecast]
-            precips = [f.get("precipitation", f.get("rainfall", 0)) for f in climate_forecast]
-            avg_temp = sum(temps) / len(temps) if temps else 0
-            total_precip = sum(precips) if precips else 0
-        
-        prompt = f"""You are an expert land management consultant specializing in land degradation prevention and restoration in Africa. Analyze the following data and provide 2-3 specific, actionable recommendations.
-
-Location: {location_name}
-Risk Level: {risk_level} (Score: {risk_score:.1f}/100)
-Vegetation Index (NDVI): {ndvi:.3f}
-Vegetation Cover: {veg_cover:.1f}%
-Average Temperature (7-day): {avg_temp:.1f}°C
-Total Precipitation (7-day): {total_precip:.1f}mm
-
-Specific Risk Factors:
-- Drought Risk: {risk_assessment.get('drought_risk', 0):.1f}
-- Erosion Risk: {risk_assessment.get('erosion_risk', 0):.1f}
-- Soil Degradation: {risk_assessment.get('soil_degradation_risk', 0):.1f}
-- Vegetation Loss: {risk_assessment.get('vegetation_loss_risk', 0):.1f}
-
-Provide 2-3 recommendations in the following JSON format only, no other text:
+        """
+        Call text_generation, retrying transient HF errors with
+        exponential backoff + jitter
+
+        When a schema is given it is sent as a TGI JSON grammar so the
+        endpoint constrains decoding to valid JSON. Honors the
+        Retry-After header when present. Non-retryable errors and
+        exhausted retries propagate to the caller, which falls back to
+        rule-based recommendations.
+        """
+        base_delay = 1.0
+        max_delay = 30.0
+
+        kwargs = dict(
+            model=model or self.model,
+            max_new_tokens=self._estimate_max_new_tokens(num_recs),
+            temperature=0.7,
+            top_p=0.95,
+            repetition_penalty=1.1,
+            do_sample=True,
+            # Halt decoding the moment the JSON array closes
+            stop_sequences=stop_sequences if stop_sequences is not None else ["]\n", "```"]
+        )
+        if schema is not None and self._grammar_supported:
+            kwargs["grammar"] = {"type": "json", "value": schema}
+
+        for attempt in range(max_retries + 1):
+            try:
+                return await self.client.text_generation(prompt, **kwargs)
+            except TypeError:
+                # Older huggingface_hub/endpoints without grammar support;
+                # drop the constraint and remember for future calls
+                if "grammar" in kwargs:
+                    logger.warning("⚠️ Grammar-constrained decoding not supported, retrying unconstrained")
+                    self._grammar_supported = False
+                    del kwargs["grammar"]
+                    continue
+                raise
+            except Exception as e:
+                response = getattr(e, "response", None)
+                status = getattr(response, "status_code", None)
+
+                if attempt >= max_retries or status not in (429, 502, 503, 504):
+                    raise
+
+                delay = min(max_delay, base_delay * (2 ** attempt)) + random.uniform(0, base_delay)
+
+                # Prefer the server's own Retry-After when it sends one
+                retry_after = response.headers.get("Retry-After") if response is not None else None
+                if retry_after:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+
+                logger.warning(
+                    f"⚠️ HF API returned {status}, retrying in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{max_retries})"
+                )
+                await asyncio.sleep(delay)
+
+    def _cache_key(self, view: InputView) -> tuple:
+        """Quantize input features into a cache key so near-identical profiles collide"""
+
+        return (
+            round(view.risk_score, 0),
+            view.risk_level,
+            round(view.ndvi, 2),
+            round(view.veg_cover, 0),
+            round(view.avg_temp, 0),
+            round(view.total_precip, 0),
+        )
+
+    def _cache_get(self, key: tuple) -> Optional[List[Dict[str, Any]]]:
+        """Return a deep copy of a live cache entry, or None if missing/expired"""
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, recommendations = entry
+        if expires_at < time.monotonic():
+            del self._response_cache[key]
+            return None
+
+        # Deep copy so callers can't mutate the cached entry
+        return copy.deepcopy(recommendations)
+
+    def _cache_put(self, key: tuple, recommendations: List[Dict[str, Any]]) -> None:
+        """Store recommendations with a TTL, evicting the oldest entry when full"""
+        if len(self._response_cache) >= self._cache_maxsize:
+            oldest = min(self._response_cache, key=lambda k: self._response_cache[k][0])
+            del self._response_cache[oldest]
+
+        self._response_cache[key] = (
+            time.monotonic() + self.cache_ttl_seconds,
+            copy.deepcopy(recommendations),
+        )
+
+    async def generate_recommendations_batch(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Generate recommendations for multiple locations concurrently
+
+        Args:
+            items: List of (location_data, risk_assessment, land_health,
+                   climate_forecast) tuples, one per location
+
+        Returns:
+            One list of recommendations per input item, in order
+        """
+
+        # Normalize every item once up front
+        views = [InputView.from_raw(*item) for item in items]
+
+        # Without AI, the rule-based fallback is pure Python - no need to gather
+        if not self.client:
+            logger.info("📋 Using rule-based recommendations for batch (AI not available)")
+            return [
+                self._generate_rule_based_recommendations(view)
+                for view in views
+            ]
+
+        return await self._generate_for_views(views)
+
+    async def _generate_for_views(self, views: List["InputView"]) -> List[List[Dict[str, Any]]]:
+        """Generate recommendations for normalized views via batched HF calls"""
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def generate_one(prompt: str, schema: Dict[str, Any], **kwargs) -> str:
+            async with semaphore:
+                return await self._call_with_retry(prompt, schema=schema, **kwargs)
+
+        async def generate_chunk(chunk: List[InputView]) -> List[List[Dict[str, Any]]]:
+            """Answer a chunk of locations with one batch prompt, falling
+            back to one call per item if the batch response doesn't parse."""
+            try:
+                response = await generate_one(
+                    self._build_batch_prompt(chunk),
+                    _BATCH_RECOMMENDATIONS_SCHEMA,
+                    # Inner arrays close with "]," so only the final "]]"
+                    # (or a fenced block) can stop a batch answer
+                    num_recs=3 * len(chunk),
+                    stop_sequences=["]]", "```"]
+                )
+                parsed = self._parse_batch_response(response, len(chunk))
+            except Exception as e:
+                logger.error(f"❌ Batch prompt failed: {e}")
+                parsed = None
+
+            if parsed is None:
+                # Retry per-item, escalated to the large model unless pinned
+                retry_model = self.model if self._model_pinned else self.large_model
+                logger.warning(f"⚠️ Batch prompt unparseable, retrying chunk per-item with {retry_model}")
+                responses = await asyncio.gather(
+                    *[
+                        generate_one(self._build_prompt(view), _RECOMMENDATIONS_SCHEMA, model=retry_model)
+                        for view in chunk
+                    ],
+                    return_exceptions=True
+                )
+                parsed = [
+                    [] if isinstance(r, Exception) else self._parse_ai_response(r)
+                    for r in responses
+                ]
+
+            return [
+                recs if recs else self._generate_rule_based_recommendations(view)
+                for view, recs in zip(chunk, parsed)
+            ]
+
+        chunks = [
+            views[i:i + self.batch_prompt_size]
+            for i in range(0, len(views), self.batch_prompt_size)
+        ]
+
+        logger.info(
+            f"🤖 Generating AI recommendations for {len(views)} locations "
+            f"in {len(chunks)} batch call(s)"
+        )
+        chunk_results = await asyncio.gather(*[generate_chunk(c) for c in chunks])
+
+        results = []
+        for chunk_result in chunk_results:
+            results.extend(chunk_result)
+        return results
+
+    def _build_prompt(self, view: InputView) -> str:
+        """Build AI prompt from a normalized input view
+
+        Only the short data block is assembled per call; the large
+        instruction template is a frozen module constant.
+        """
+
+        data_block = "\n".join([
+            f"Location: {view.location_name}",
+            f"Risk Level: {view.risk_level} (Score: {view.risk_score:.1f}/100)",
+            f"Vegetation Index (NDVI): {view.ndvi:.3f}",
+            f"Vegetation Cover: {view.veg_cover:.1f}%",
+            f"Average Temperature (7-day): {view.avg_temp:.1f}°C",
+            f"Total Precipitation (7-day): {view.total_precip:.1f}mm",
+            "",
+            "Specific Risk Factors:",
+            f"- Drought Risk: {view.drought_risk:.1f}",
+            f"- Erosion Risk: {view.erosion_risk:.1f}",
+            f"- Soil Degradation: {view.soil_degradation_risk:.1f}",
+            f"- Vegetation Loss: {view.vegetation_loss_risk:.1f}",
+        ])
+
+        return _PROMPT_TEMPLATE % data_block
+    
+    def _build_batch_prompt(self, views: List[InputView]) -> str:
+        """Build one prompt covering multiple locations, answered as a JSON array-of-arrays"""
+
+        cases = []
+        for i, view in enumerate(views, 1):
+            cases.append(
+                f"Case {i}: Location: {view.location_name}; "
+                f"Risk Level: {view.risk_level} (Score: {view.risk_score:.1f}/100); "
+                f"NDVI: {view.ndvi:.3f}; Vegetation Cover: {view.veg_cover:.1f}%; "
+                f"Avg Temperature (7-day): {view.avg_temp:.1f}°C; "
+                f"Total Precipitation (7-day): {view.total_precip:.1f}mm; "
+                f"Drought Risk: {view.drought_risk:.1f}; "
+                f"Erosion Risk: {view.erosion_risk:.1f}"
+            )
+
+        cases_block = "\n".join(cases)
+
+        prompt = f"""You are an expert land management consultant specializing in land degradation prevention and restoration in Africa. For EACH case below, provide 2-3 specific, actionable recommendations.
+
+{cases_block}
+
+Return JSON only, no other text: an array with exactly {len(views)} inner arrays, one per case, in order. Each inner array holds that case's recommendations in this format:
 [
-  {{
-    "priority": "high|medium|low",
-    "category": "restoration|irrigation|soil_management|vegetation|monitoring",
-    "action_title": "Brief title (max 50 chars)",
-    "action_description": "Detailed action plan (max 200 chars)",
-    "urgency_hours": 168,
-    "expected_risk_reduction": 15.5
-  }}
+  [
+    {{
+      "priority": "high|medium|low",
+      "category": "restoration|irrigation|soil_management|vegetation|monitoring",
+      "action_title": "Brief title (max 50 chars)",
+      "action_description": "Detailed action plan (max 200 chars)",
+      "urgency_hours": 168,
+      "expected_risk_reduction": 15.5
+    }}
+  ]
 ]
 
 Focus on practical, cost-effective actions suitable for African smallholder farmers."""
 
         return prompt
-    
-    def _parse_ai_response(self, response: str, risk_assessment: Dict[str, Any]) -> List[Dict[str, Any]]:
+
+    def _parse_ai_response(self, response: str) -> List[Dict[str, Any]]:
         """Parse AI response into structured recommendations"""
-        
+
         try:
             # Try to find JSON array in response
-            start_idx = response.find('[')
-            end_idx = response.rfind(']') + 1
-            
-            if start_idx == -1 or end_idx == 0:
+            match = _JSON_ARRAY_RE.search(response)
+
+            if not match:
                 logger.warning("⚠️ No JSON array found in AI response")
                 return []
-            
-            json_str = response[start_idx:end_idx]
-            recommendations = json.loads(json_str)
-            
-            # Validate and clean recommendations
-            cleaned = []
-            for rec in recommendations:
-                if not isinstance(rec, dict):
-                    continue
-                
-                # Ensure required fields exist
-                cleaned_rec = {
-                    "priority": rec.get("priority", "medium").lower(),
-                    "category": rec.get("category", "general"),
-                    "action_title": rec.get("action_title", "")[:100],
-                    "action_description": rec.get("action_description", "")[:500],
-                    "urgency_hours": int(rec.get("urgency_hours", 168)),
-                    "expected_risk_reduction": float(rec.get("expected_risk_reduction", 10.0)),
-                    "expected_cost_usd": float(rec.get("expected_cost_usd", 0)),
-                    "recommended_species": rec.get("recommended_species")
-                }
-                
-                # Skip if missing critical info
-                if not cleaned_rec["action_title"] or not cleaned_rec["action_description"]:
-                    continue
-                
-                cleaned.append(cleaned_rec)
-            
-            return cleaned
-            
-        except json.JSONDecodeError as e:
+
+            recommendations = _json_loads(match.group(0))
+
+            return self._clean_recommendations(recommendations)
+
+        except ValueError as e:  # json/orjson decode errors
             logger.error(f"❌ Failed to parse AI response as JSON: {e}")
             logger.debug(f"Response: {response}")
             return []
         except Exception as e:
             logger.error(f"❌ Error parsing AI response: {e}")
             return []
+
+    def _parse_batch_response(self, response: str, expected: int) -> Optional[List[List[Dict[str, Any]]]]:
+        """
+        Parse a batch response (JSON array-of-arrays) into per-case
+        recommendation lists, or None if the shape doesn't match
+        """
+
+        try:
+            match = _JSON_ARRAY_RE.search(response)
+
+            if not match:
+                logger.warning("⚠️ No JSON array found in AI batch response")
+                return None
+
+            parsed = _json_loads(match.group(0))
+
+            if not isinstance(parsed, list) or len(parsed) != expected:
+                logger.warning(f"⚠️ Batch response has {len(parsed) if isinstance(parsed, list) else 'no'} cases, expected {expected}")
+                return None
+
+            return [
+                self._clean_recommendations(case) if isinstance(case, list) else []
+                for case in parsed
+            ]
+
+        except ValueError as e:  # json/orjson decode errors
+            logger.error(f"❌ Failed to parse AI batch response as JSON: {e}")
+            logger.debug(f"Response: {response}")
+            return None
+        except Exception as e:
+            logger.error(f"❌ Error parsing AI batch response: {e}")
+            return None
+
+    def _clean_recommendations(self, recommendations: List[Any]) -> List[Dict[str, Any]]:
+        """Validate and normalize raw recommendation dicts from the AI"""
+
+        cleaned = []
+        for rec in recommendations:
+            if not isinstance(rec, dict):
+                continue
+
+            # Ensure required fields exist
+            cleaned_rec = {
+                "priority": rec.get("priority", "medium").lower(),
+                "category": rec.get("category", "general"),
+                "action_title": rec.get("action_title", "")[:100],
+                "action_description": rec.get("action_description", "")[:500],
+                "urgency_hours": int(rec.get("urgency_hours", 168)),
+                "expected_risk_reduction": float(rec.get("expected_risk_reduction", 10.0)),
+                "expected_cost_usd": float(rec.get("expected_cost_usd", 0)),
+                "recommended_species": rec.get("recommended_species")
+            }
+
+            # Skip if missing critical info
+            if not cleaned_rec["action_title"] or not cleaned_rec["action_description"]:
+                continue
+
+            cleaned.append(cleaned_rec)
+
+        return cleaned
     
-    def _generate_rule_based_recommendations(
-        self,
-        location_data: Dict[str, Any],
-        risk_assessment: Dict[str, Any],
-        land_health: Dict[str, Any],
-        climate_forecast: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    def _generate_rule_based_recommendations(self, view: InputView) -> List[Dict[str, Any]]:
         """
         Generate recommendations using rule-based logic
         (fallback when AI is not available)
+
+        Quantizes the inputs into a bucket and looks up the memoized
+        rule-table result, so plots sharing a risk bracket pay for one
+        table walk total. Returns fresh copies per call.
         """
-        
-        recommendations = []
-        risk_score = risk_assessment.get("total_risk_score", 50)
-        risk_level = risk_assessment.get("risk_level", "MEDIUM")
-        ndvi = land_health.get("ndvi", 0.5)
-        veg_cover = land_health.get("vegetation_cover_pct", land_health.get("vegetation_cover", 50))
-        drought_risk = risk_assessment.get("drought_risk", 0)
-        erosion_risk = risk_assessment.get("erosion_risk", 0)
-        
-        # High risk - urgent intervention needed
-        if risk_score >= 70 or risk_level == "CRITICAL":
-            recommendations.append({
-                "priority": "high",
-                "category": "restoration",
-                "action_title": "Urgent: Implement soil conservation measures",
-                "action_description": "High degradation risk detected. Immediately establish contour bunds, plant cover crops, and restrict grazing to prevent further degradation.",
-                "urgency_hours": 72,
-                "expected_risk_reduction": 25.0,
-                "expected_cost_usd": 500,
-                "recommended_species": None
-            })
-        
-        # Low vegetation - restoration needed
-        if ndvi < 0.3 or veg_cover < 30:
-            recommendations.append({
-                "priority": "high",
-                "category": "vegetation",
-                "action_title": "Restore vegetation cover",
-                "action_description": "Low vegetation detected (NDVI: {:.2f}). Plant native grass species and fast-growing trees. Consider agroforestry with Acacia or Moringa species.".format(ndvi),
-                "urgency_hours": 168,
-                "expected_risk_reduction": 20.0,
-                "expected_cost_usd": 300,
-                "recommended_species": [
-                    {"name": "Acacia senegal", "type": "tree"},
-                    {"name": "Vetiver grass", "type": "grass"}
-                ]
-            })
-        
-        # High drought risk - water conservation
-        if drought_risk > 5:
-            recommendations.append({
-                "priority": "high",
-                "category": "irrigation",
-                "action_title": "Implement water conservation techniques",
-                "action_description": "High drought risk detected. Install rainwater harvesting systems, apply mulching, and consider drip irrigation for critical crops.",
-                "urgency_hours": 120,
-                "expected_risk_reduction": 18.0,
-                "expected_cost_usd": 400,
-                "recommended_species": None
-            })
-        
-        # High erosion risk - soil management
-        if erosion_risk > 5:
-            recommendations.append({
-                "priority": "high",
-                "category": "soil_management",
-                "action_title": "Prevent soil erosion",
-                "action_description": "High erosion risk detected. Establish terracing on slopes, plant windbreaks, and use cover crops to protect soil. Avoid bare soil during rainy season.",
-                "urgency_hours": 96,
-                "expected_risk_reduction": 22.0,
-                "expected_cost_usd": 450,
-                "recommended_species": [
-                    {"name": "Leucaena leucocephala", "type": "tree"},
-                    {"name": "Napier grass", "type": "grass"}
-                ]
-            })
-        
-        # Moderate risk - regular monitoring
-        if risk_score >= 40 and risk_score < 70:
-            recommendations.append({
-                "priority": "medium",
-                "category": "monitoring",
-                "action_title": "Establish regular monitoring routine",
-                "action_description": "Moderate risk level detected. Set up monthly soil and vegetation monitoring. Track rainfall and adjust management practices accordingly.",
-                "urgency_hours": 168,
-                "expected_risk_reduction": 15.0,
-                "expected_cost_usd": 100,
-                "recommended_species": None
-            })
-        
-        # Low risk - maintenance
-        if risk_score < 40:
-            recommendations.append({
-                "priority": "low",
-                "category": "monitoring",
-                "action_title": "Maintain current good practices",
-                "action_description": "Land is in relatively good condition. Continue current management practices and monitor for any changes. Consider introducing nitrogen-fixing plants to improve soil fertility.",
-                "urgency_hours": 336,
-                "expected_risk_reduction": 10.0,
-                "expected_cost_usd": 50,
-                "recommended_species": [
-                    {"name": "Sesbania sesban", "type": "tree"},
-                    {"name": "Cowpea", "type": "crop"}
-                ]
-            })
-        
-        # Ensure we always return at least one recommendation
-        if not recommendations:
-            recommendations.append({
-                "priority": "medium",
-                "category": "general",
-                "action_title": "Conduct comprehensive land assessment",
-                "action_description": "Perform detailed soil testing, vegetation survey, and water availability assessment to develop targeted management plan.",
-                "urgency_hours": 168,
-                "expected_risk_reduction": 12.0,
-                "expected_cost_usd": 200,
-                "recommended_species": None
-            })
-        
-        # Limit to top 3 recommendations
-        return recommendations[:3]
+
+        bucket_key = (
+            round(view.risk_score / 5) * 5,
+            view.risk_level,
+            round(view.ndvi * 10) / 10,
+            round(view.veg_cover / 5) * 5,
+            view.drought_risk > 5,
+            view.erosion_risk > 5,
+        )
+
+        return [copy.deepcopy(rec) for rec in _rules_for(bucket_key)]
 
 
 # Utility function for testing
 def test_service():
     """Test the recommendation service"""
+    import asyncio
+
     service = HuggingFaceRecommendationService()
     
     test_location = {"name": "Test Farm", "latitude": -1.2921, "longitude": 36.8219}
@@ -381,9 +1049,9 @@ def test_service():
         {"date": "2025-10-15", "temp_avg": 27, "precipitation": 5}
     ]
     
-    recommendations = service.generate_recommendations(
+    recommendations = asyncio.run(service.generate_recommendations(
         test_location, test_risk, test_health, test_forecast
-    )
+    ))
     
     print(f"\n✅ Generated {len(recommendations)} recommendations:\n")
     for i, rec in enumerate(recommendations, 1):
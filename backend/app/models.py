@@ -1,13 +1,14 @@
 from sqlalchemy import (
-    Column, String, Float, DateTime, ForeignKey, Text, Boolean
+    Column, String, Float, DateTime, ForeignKey, Text, Boolean, FetchedValue, text
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship, DeclarativeBase
+from geoalchemy2 import Geography
 from datetime import datetime
-import uuid
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    pass
 
 # ----------------------------
 # LOCATION MODEL
@@ -15,22 +16,33 @@ Base = declarative_base()
 class Location(Base):
     __tablename__ = "locations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     name = Column(String, index=True, nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
+    # PostGIS point generated by the database from latitude/longitude and
+    # covered by a GiST index, so radius / nearest-location queries prune
+    # via the index instead of seq-scanning the float pair
+    # (see scripts/locations_geography.sql)
+    geom = Column(Geography("POINT", srid=4326), server_default=FetchedValue(), nullable=True)
     country = Column(String, nullable=False)
     region = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Relationships
-    climate_data = relationship("ClimateData", back_populates="location", cascade="all, delete-orphan")
-    land_health_data = relationship("LandHealth", back_populates="location", cascade="all, delete-orphan")
-    predictions = relationship("Prediction", back_populates="location", cascade="all, delete-orphan")
-    recommendations = relationship("Recommendation", back_populates="location", cascade="all, delete-orphan")
-    alerts = relationship("Alert", back_populates="location", cascade="all, delete-orphan")
-    risk_assessments = relationship("RiskAssessment", back_populates="location", cascade="all, delete-orphan")
+    # Relationships. passive_deletes=True: the foreign keys already carry
+    # ondelete="CASCADE", so deleting a location is one statement — the
+    # session doesn't load children and issue per-row DELETEs.
+    # The long-tail collections are lazy="raise": looping
+    # over a list of locations and touching them would silently fire one
+    # query per row (N+1), so accidental access errors out instead —
+    # endpoints that need them must opt in with selectinload()
+    climate_data = relationship("ClimateData", back_populates="location", cascade="all, delete-orphan", passive_deletes=True)
+    land_health_data = relationship("LandHealth", back_populates="location", cascade="all, delete-orphan", passive_deletes=True)
+    predictions = relationship("Prediction", back_populates="location", cascade="all, delete-orphan", passive_deletes=True)
+    recommendations = relationship("Recommendation", back_populates="location", cascade="all, delete-orphan", passive_deletes=True, lazy="raise")
+    alerts = relationship("Alert", back_populates="location", cascade="all, delete-orphan", passive_deletes=True, lazy="raise")
+    risk_assessments = relationship("RiskAssessment", back_populates="location", cascade="all, delete-orphan", passive_deletes=True)
 
 
 # ----------------------------
@@ -39,7 +51,7 @@ class Location(Base):
 class ClimateData(Base):
     __tablename__ = "climate_data"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), nullable=False)
     date = Column(DateTime, default=datetime.utcnow)
     temperature = Column(Float)  # in Celsius
@@ -57,7 +69,7 @@ class ClimateData(Base):
 class LandHealth(Base):
     __tablename__ = "land_health"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), nullable=False)
     date = Column(DateTime, default=datetime.utcnow)
     soil_moisture = Column(Float)
@@ -76,7 +88,7 @@ class LandHealth(Base):
 class Prediction(Base):
     __tablename__ = "predictions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), nullable=False)
     prediction_date = Column(DateTime, default=datetime.utcnow)
     target_date = Column(DateTime, nullable=False)
@@ -95,7 +107,7 @@ class Prediction(Base):
 class Recommendation(Base):
     __tablename__ = "recommendations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), nullable=False)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
@@ -116,8 +128,10 @@ class Recommendation(Base):
 class RiskAssessment(Base):
     __tablename__ = "risk_assessments"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    # No composite index covers this table (unlike the others — see
+    # scripts/composite_indexes.sql), so the FK filter gets its own
+    location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), nullable=False, index=True)
     date = Column(DateTime, default=datetime.utcnow)
     category = Column(String, nullable=False)
     risk_level = Column(Float)
@@ -134,7 +148,7 @@ class RiskAssessment(Base):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     username = Column(String, unique=True, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
@@ -151,8 +165,8 @@ class User(Base):
 class Alert(Base):
     __tablename__ = "alerts"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), nullable=False, index=True)
     alert_type = Column(String, nullable=False)
     title = Column(String, nullable=False)
     message = Column(Text, nullable=False)
@@ -2,6 +2,17 @@
 Routes package initialization
 """
 from fastapi import APIRouter
+
+# orjson serializes the row-heavy list responses several times faster
+# than stdlib json; fall back when it isn't installed. The guard is on
+# orjson itself — ORJSONResponse always imports and only asserts orjson
+# at render time
+try:
+	import orjson  # noqa: F401
+	from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+	from fastapi.responses import JSONResponse as DefaultResponse
+
 from app.routes import (
 	climate,
 	land_health,
@@ -11,7 +22,7 @@ from app.routes import (
 )
 
 
-router = APIRouter()
+router = APIRouter(default_response_class=DefaultResponse)
 
 router.include_router(climate.router)
 router.include_router(land_health.router)
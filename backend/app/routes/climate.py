@@ -1,64 +1,123 @@
 """
 Climate data endpoints
 """
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 from datetime import datetime
-from app.database import supabase
+from app.cache import cached
+from app.database import get_supabase_client, pool_fetch
 from app.services.weather_services import WeatherStreamingService
 
 router = APIRouter(prefix="/api/climate", tags=["climate"])
 
+# Single service instance: the HTTP session is shared process-wide, so
+# weather calls reuse pooled TCP/TLS connections across requests
+weather_service = WeatherStreamingService()
+
+
+# Every climate endpoint resolves the same location row first; 60 s of
+# caching keeps that lookup off the database on bursts
+@cached(ttl=60)
+async def _get_location(location_id: str):
+    # Only the three columns the weather calls need — not the whole row
+    rows = await pool_fetch(
+        "SELECT name, latitude, longitude FROM locations WHERE id = $1", location_id
+    )
+    if rows is not None:
+        return rows[0] if rows else None
+
+    supabase = get_supabase_client()
+    result = (
+        supabase.table("locations")
+        .select("name, latitude, longitude")
+        .eq("id", location_id)
+        .limit(1)
+        .execute()
+    )
+    return result.data[0] if result.data else None
 
+
+# Weather doesn't change at sub-minute granularity: 5 minutes of caching
+# trades a little staleness for provider quota and round-trip latency
 @router.get("/{location_id}/current-weather")
-async def get_current_weather(location_id: str):
-    """Get real-time weather for location"""
+@cached(ttl=300)
+async def get_current_weather(
+    location_id: str,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+):
+    """Get real-time weather for location
+
+    Map views already know approximate coordinates; passing them as
+    lat/lon hints lets the weather call start in parallel with the
+    location lookup instead of waiting behind it.
+    """
     try:
-        # Get location coordinates
-        location = supabase.table("locations").select("*").eq("id", location_id).execute()
-        
-        if not location.data:
-            raise HTTPException(status_code=404, detail="Location not found")
-        
-        loc = location.data[0]
-        
-        # Fetch real-time weather
-        async with WeatherStreamingService() as weather_service:
+        if lat is not None and lon is not None:
+            # Speculative fetch: overlap the two independent calls
+            loc, weather = await asyncio.gather(
+                _get_location(location_id),
+                weather_service.get_current_weather(lat, lon),
+            )
+            if not loc:
+                raise HTTPException(status_code=404, detail="Location not found")
+
+            # Hints off by more than ~5 km (0.05°): refetch at the
+            # true coordinates
+            if (
+                abs(loc['latitude'] - lat) > 0.05
+                or abs(loc['longitude'] - lon) > 0.05
+            ):
+                weather = await weather_service.get_current_weather(
+                    loc['latitude'],
+                    loc['longitude']
+                )
+        else:
+            # Get location coordinates
+            loc = await _get_location(location_id)
+
+            if not loc:
+                raise HTTPException(status_code=404, detail="Location not found")
+
+            # Fetch real-time weather
             weather = await weather_service.get_current_weather(
                 loc['latitude'],
                 loc['longitude']
             )
-        
+
         return {
             "location_id": location_id,
             "location_name": loc['name'],
             "weather": weather,
             "timestamp": datetime.now().isoformat()
         }
-    
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Forecasts update on provider model runs (hours apart): cache for 1 h
 @router.get("/{location_id}/forecast")
+@cached(ttl=3600)
 async def get_weather_forecast(location_id: str, days: int = Query(default=7, le=16)):
     """Get weather forecast"""
     try:
         # Get location
-        location = supabase.table("locations").select("*").eq("id", location_id).execute()
-        
-        if not location.data:
+        loc = await _get_location(location_id)
+
+        if not loc:
             raise HTTPException(status_code=404, detail="Location not found")
-        
-        loc = location.data[0]
-        
+
         # Fetch forecast
-        async with WeatherStreamingService() as weather_service:
-            forecast = await weather_service.get_forecast(
-                loc['latitude'],
-                loc['longitude'],
-                days
-            )
+        forecast = await weather_service.get_forecast(
+            loc['latitude'],
+            loc['longitude'],
+            days
+        )
         
         return {
             "location_id": location_id,
@@ -35,6 +35,34 @@ async def get_risk_trend(location_id: UUID, months: int = 6, supabase: Client =
     try:
         since_date = (datetime.utcnow() - timedelta(days=30 * months)).isoformat()
 
+        # Monthly rollup first: the materialized view holds one
+        # pre-aggregated row per location per month, so the chart needs
+        # ~6 rows instead of every raw assessment
+        # (see scripts/degradation_risk_monthly.sql)
+        try:
+            rollup = (
+                supabase.table("degradation_risk_monthly")
+                .select("month, risk_score, risk_type")
+                .eq("location_id", str(location_id))
+                .gte("month", since_date)
+                .order("month", desc=True)
+                .execute()
+            )
+            if rollup.data:
+                return {
+                    "trend": [
+                        {
+                            "date": r["month"],
+                            "risk_score": r.get("risk_score", 0),
+                            "risk_type": r.get("risk_type", "Unknown"),
+                        }
+                        for r in rollup.data
+                    ]
+                }
+        except Exception:
+            # View not deployed yet — fall through to the raw rows
+            pass
+
         response = (
             supabase.table("degradation_risk")
             .select("*")
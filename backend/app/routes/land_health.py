@@ -1,28 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Response
 from supabase import Client
 from typing import List
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 import random
 
-from app.database import get_db
+# NumPy vectorizes the sample-data generators (one array op instead of
+# a Python loop of per-row random calls)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pydantic import TypeAdapter
+
+from app.config import DEMO_MODE
+from app.database import get_db, get_db_pool
 from app.schemas import LandHealth, LandHealthCreate
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
+router = APIRouter()
 
-@router.get("/{location_id}", response_model=List[LandHealth])
+# Built once at import: validates a whole page of rows and dumps it to
+# JSON in pydantic-core, skipping FastAPI's per-request response_model
+# machinery and jsonable_encoder walk on the hottest list endpoint
+_LAND_HEALTH_LIST = TypeAdapter(List[LandHealth])
+
+
+# The whole 30-day response is aggregated into JSON by Postgres: the
+# rename happens in the SELECT and the bytes go straight to the client,
+# skipping per-row dict construction and FastAPI re-serialization
+# PostgREST can alias columns in the projection (alias:column), so the
+# frontend rename ships from the database on the fallback path too —
+# no per-row Python rewriting
+_LAND_HEALTH_COLUMNS = (
+    "id,location_id,date,ndvi:vegetation_index,vegetation_cover:soil_moisture,"
+    "soil_ph,erosion_risk,overall_health_score,created_at"
+)
+
+_LAND_HEALTH_JSON_SQL = (
+    "SELECT COALESCE(json_agg(row_to_json(t) ORDER BY t.date DESC), '[]')"
+    " FROM ("
+    "   SELECT id, location_id, date, vegetation_index AS ndvi,"
+    "          soil_moisture AS vegetation_cover, soil_ph, erosion_risk,"
+    "          overall_health_score, created_at"
+    "   FROM land_health"
+    "   WHERE location_id = $1 AND date >= now() - interval '30 days'"
+    " ) t"
+)
+
+
+@router.get("/{location_id}")
 async def get_land_health(
     location_id: UUID,
     supabase: Client = Depends(get_db)
 ):
     """Get land health data for a specific location (last 30 days)"""
     try:
+        pool = await get_db_pool()
+        if pool is not None:
+            try:
+                async with pool.acquire() as con:
+                    body = await con.fetchval(_LAND_HEALTH_JSON_SQL, str(location_id))
+                if body and body != "[]":
+                    return Response(content=body, media_type="application/json")
+            except Exception:
+                logger.exception("Pooled land health query failed")
+
         thirty_days_ago = (datetime.utcnow() - timedelta(days=30)).isoformat()
 
         response = (
             supabase.table("land_health")
-            .select("*")
+            .select(_LAND_HEALTH_COLUMNS)
             .eq("location_id", str(location_id))
             .gte("date", thirty_days_ago)
             .order("date", desc=True)
@@ -30,19 +82,19 @@ async def get_land_health(
         )
 
         if not response.data:
-            return generate_sample_land_health(location_id)
+            return generate_sample_land_health(location_id) if DEMO_MODE else []
 
-        # ✅ Rename keys for frontend compatibility
-        data = []
-        for record in response.data:
-            record["ndvi"] = record.get("vegetation_index") or record.get("ndvi")
-            record["vegetation_cover"] = record.get("soil_moisture") or record.get("vegetation_cover")
-            data.append(record)
-
-        return data
-    except Exception as e:
-        print(f"Error fetching land health: {e}")
-        return generate_sample_land_health(location_id)
+        return Response(
+            content=_LAND_HEALTH_LIST.dump_json(
+                _LAND_HEALTH_LIST.validate_python(response.data), by_alias=True
+            ),
+            media_type="application/json",
+        )
+    except Exception:
+        logger.exception("Error fetching land health")
+        if DEMO_MODE:
+            return generate_sample_land_health(location_id)
+        raise HTTPException(status_code=503, detail="Database unavailable")
 
 
 @router.post("/", response_model=LandHealth)
@@ -52,8 +104,8 @@ async def create_land_health(
 ):
     """Create new land health entry"""
     try:
+        # id omitted: the table defaults to gen_random_uuid() server-side
         data = land_health.model_dump()
-        data["id"] = str(uuid4())
         data["created_at"] = datetime.utcnow().isoformat()
 
         response = supabase.table("land_health").insert(data).execute()
@@ -75,7 +127,7 @@ async def get_latest_land_health(
     try:
         response = (
             supabase.table("land_health")
-            .select("*")
+            .select(_LAND_HEALTH_COLUMNS)
             .eq("location_id", str(location_id))
             .order("date", desc=True)
             .limit(1)
@@ -83,20 +135,20 @@ async def get_latest_land_health(
         )
 
         if not response.data:
+            if DEMO_MODE:
+                sample_data = generate_sample_land_health(location_id)
+                return sample_data[0] if sample_data else None
+            raise HTTPException(status_code=404, detail="No land health data found")
+
+        return response.data[0]
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error fetching latest land health")
+        if DEMO_MODE:
             sample_data = generate_sample_land_health(location_id)
             return sample_data[0] if sample_data else None
-
-        record = response.data[0]
-
-        # ✅ Align with frontend naming
-        record["ndvi"] = record.get("vegetation_index") or record.get("ndvi")
-        record["vegetation_cover"] = record.get("soil_moisture") or record.get("vegetation_cover")
-
-        return record
-    except Exception as e:
-        print(f"Error fetching latest land health: {e}")
-        sample_data = generate_sample_land_health(location_id)
-        return sample_data[0] if sample_data else None
+        raise HTTPException(status_code=503, detail="Database unavailable")
 
 
 def generate_sample_land_health(location_id: UUID) -> List[dict]:
@@ -104,6 +156,40 @@ def generate_sample_land_health(location_id: UUID) -> List[dict]:
     sample_data = []
     base_date = datetime.utcnow()
 
+    if np is not None:
+        # Vectorized: draw all 30 days of randoms in five array ops
+        rng = np.random.default_rng()
+        base_health = (70 + rng.uniform(-15, 15, 30)).round(1)
+        soil_moisture = np.clip(base_health + rng.uniform(-10, 10, 30), 20, 80).round(1)
+        vegetation_index = np.clip(base_health / 100 + rng.uniform(-0.1, 0.1, 30), 0.3, 0.9).round(2)
+        erosion = np.clip(100 - base_health + rng.uniform(-10, 10, 30), 5, 50).round(1)
+        soil_ph = (6.5 + rng.uniform(-0.5, 0.5, 30)).round(1)
+
+        for i, (health, moisture, ndvi, ero, ph) in enumerate(
+            zip(
+                base_health.tolist(),
+                soil_moisture.tolist(),
+                vegetation_index.tolist(),
+                erosion.tolist(),
+                soil_ph.tolist(),
+            )
+        ):
+            date = base_date - timedelta(days=i)
+            sample_data.append({
+                "id": uuid4().hex,
+                "location_id": str(location_id),
+                "date": date.isoformat(),
+                # ✅ Return frontend-compatible keys
+                "ndvi": ndvi,
+                "vegetation_cover": moisture,
+                "soil_ph": ph,
+                "erosion_risk": ero,
+                "overall_health_score": health,
+                "created_at": date.isoformat(),
+            })
+
+        return sample_data
+
     for i in range(30):
         date = base_date - timedelta(days=i)
 
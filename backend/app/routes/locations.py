@@ -1,12 +1,17 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException
 from supabase import Client
 from typing import List
 from uuid import UUID, uuid4
 from datetime import datetime
 
-from app.database import get_db
+from app.config import DEMO_MODE
+from app.database import get_db, pool_fetch
 from app.schemas import Location, LocationCreate, LocationUpdate
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -18,13 +23,23 @@ async def get_locations(
 ):
     """Get all locations"""
     try:
+        # Pooled SQL first: persistent connections skip the per-request
+        # TLS handshake and the PostgREST hop
+        rows = await pool_fetch(
+            "SELECT * FROM locations ORDER BY name OFFSET $1 LIMIT $2", skip, limit
+        )
+        if rows:
+            return rows
+
         response = supabase.table('locations').select("*").range(skip, skip + limit - 1).execute()
         if not response.data:
-            return generate_sample_locations()
+            return generate_sample_locations() if DEMO_MODE else []
         return response.data
-    except Exception as e:
-        print(f"Error fetching locations: {e}")
-        return generate_sample_locations()
+    except Exception:
+        logger.exception("Error fetching locations")
+        if DEMO_MODE:
+            return generate_sample_locations()
+        raise HTTPException(status_code=503, detail="Database unavailable")
 
 
 @router.get("/{location_id}", response_model=Location)
@@ -34,6 +49,12 @@ async def get_location(
 ):
     """Get a specific location by ID"""
     try:
+        rows = await pool_fetch("SELECT * FROM locations WHERE id = $1", location_id)
+        if rows is not None:
+            if not rows:
+                raise HTTPException(status_code=404, detail="Location not found")
+            return rows[0]
+
         response = supabase.table('locations').select("*").eq('id', str(location_id)).execute()  # ✅ UUID cast to str
         if not response.data:
             raise HTTPException(status_code=404, detail="Location not found")
@@ -51,8 +72,8 @@ async def create_location(
 ):
     """Create a new location"""
     try:
+        # id omitted: the table defaults to gen_random_uuid() server-side
         data = location.model_dump()
-        data["id"] = str(uuid4())  # ✅ Generate UUID for id
 
         response = supabase.table('locations').insert(data).execute()
         if not response.data:
@@ -102,37 +123,37 @@ async def delete_location(
         raise HTTPException(status_code=500, detail=f"Error deleting location: {str(e)}")
 
 
+# Static part of the sample payload built once; each call only overlays
+# a fresh id and timestamps
+_SAMPLE_LOCATIONS = (
+    {
+        "name": "Nakuru",
+        "latitude": -0.3031,
+        "longitude": 36.0800,
+        "country": "Kenya",
+        "region": "Rift Valley",
+    },
+    {
+        "name": "Nairobi",
+        "latitude": -1.2921,
+        "longitude": 36.8219,
+        "country": "Kenya",
+        "region": "Nairobi",
+    },
+    {
+        "name": "Mombasa",
+        "latitude": -4.0435,
+        "longitude": 39.6682,
+        "country": "Kenya",
+        "region": "Coast",
+    },
+)
+
+
 def generate_sample_locations() -> List[dict]:
     """Generate sample locations for testing"""
+    now = datetime.utcnow().isoformat()
     return [
-        {
-            "id": str(uuid4()),  # ✅ UUID for consistency
-            "name": "Nakuru",
-            "latitude": -0.3031,
-            "longitude": 36.0800,
-            "country": "Kenya",
-            "region": "Rift Valley",
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
-        },
-        {
-            "id": str(uuid4()),
-            "name": "Nairobi",
-            "latitude": -1.2921,
-            "longitude": 36.8219,
-            "country": "Kenya",
-            "region": "Nairobi",
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
-        },
-        {
-            "id": str(uuid4()),
-            "name": "Mombasa",
-            "latitude": -4.0435,
-            "longitude": 39.6682,
-            "country": "Kenya",
-            "region": "Coast",
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
-        }
+        {**base, "id": uuid4().hex, "created_at": now, "updated_at": now}
+        for base in _SAMPLE_LOCATIONS
     ]
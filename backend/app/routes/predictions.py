@@ -1,3 +1,6 @@
+import functools
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException
 from supabase import Client
 from typing import List
@@ -5,9 +8,19 @@ from datetime import datetime, timedelta
 from uuid import UUID, uuid4
 import random
 
+# NumPy vectorizes the sample-data generator (one array op instead of
+# a Python loop of per-row random calls)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app.config import DEMO_MODE
 from app.database import get_db
 from app.schemas import Prediction, PredictionCreate
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -28,12 +41,14 @@ async def get_predictions(
         )
 
         if not response.data:
-            return generate_sample_predictions(location_id)
+            return generate_sample_predictions(location_id) if DEMO_MODE else []
 
         return response.data
-    except Exception as e:
-        print(f"Error fetching predictions: {e}")
-        return generate_sample_predictions(location_id)
+    except Exception:
+        logger.exception("Error fetching predictions")
+        if DEMO_MODE:
+            return generate_sample_predictions(location_id)
+        raise HTTPException(status_code=503, detail="Database unavailable")
 
 
 @router.post("/", response_model=Prediction)
@@ -43,8 +58,8 @@ async def create_prediction(
 ):
     """Create a new prediction"""
     try:
+        # id omitted: the table defaults to gen_random_uuid() server-side
         data = prediction.model_dump()
-        data["id"] = str(uuid4())  # ✅ Ensure UUID primary key
         data["location_id"] = str(data["location_id"])  # ✅ Cast to string
 
         response = supabase.table('predictions').insert(data).execute()
@@ -85,30 +100,56 @@ async def get_latest_prediction(
         raise HTTPException(status_code=500, detail=f"Error fetching prediction: {str(e)}")
 
 
+_PREDICTION_TYPES = (
+    ("temperature", 25.0, 5.0),
+    ("precipitation", 30.0, 20.0),
+    ("risk_level", 45.0, 25.0),
+)
+
+
+@functools.cache
+def _sample_prediction_grid():
+    """Numeric skeleton of the sample payload, drawn once per process
+
+    Sample data only has to look plausible, so one frozen draw is reused
+    by every response; each call merely overlays fresh ids and dates.
+    """
+    rng = np.random.default_rng() if np is not None else None
+    grid = []
+
+    for pred_type, base_value, variance in _PREDICTION_TYPES:
+        if rng is not None:
+            # Vectorized: all 7 days of randoms in two array ops
+            values = tuple((base_value + rng.uniform(-variance, variance, 7)).round(2).tolist())
+            confidences = tuple(rng.uniform(0.7, 0.95, 7).round(2).tolist())
+        else:
+            values = tuple(round(base_value + random.uniform(-variance, variance), 2) for _ in range(7))
+            confidences = tuple(round(random.uniform(0.7, 0.95), 2) for _ in range(7))
+
+        grid.append((pred_type, values, confidences))
+
+    return tuple(grid)
+
+
 def generate_sample_predictions(location_id: UUID) -> List[dict]:
     """Generate sample predictions for testing"""
     sample_predictions = []
     base_date = datetime.utcnow()
+    base_iso = base_date.isoformat()
 
-    prediction_types = [
-        ("temperature", 25.0, 5.0),
-        ("precipitation", 30.0, 20.0),
-        ("risk_level", 45.0, 25.0)
-    ]
-
-    for pred_type, base_value, variance in prediction_types:
-        for j in range(7):  # 7 days of predictions
+    for pred_type, values, confidences in _sample_prediction_grid():
+        for j, (value, confidence) in enumerate(zip(values, confidences)):
             target_date = base_date + timedelta(days=j + 1)
             sample_predictions.append({
-                "id": str(uuid4()),  # ✅ Use UUID for sample data
+                "id": uuid4().hex,  # in-memory only; hex skips dash formatting
                 "location_id": str(location_id),
-                "prediction_date": base_date.isoformat(),
+                "prediction_date": base_iso,
                 "target_date": target_date.isoformat(),
                 "prediction_type": pred_type,
-                "predicted_value": round(base_value + random.uniform(-variance, variance), 2),
-                "confidence_score": round(random.uniform(0.7, 0.95), 2),
+                "predicted_value": value,
+                "confidence_score": confidence,
                 "model_version": "v1.0",
-                "created_at": base_date.isoformat()
+                "created_at": base_iso
             })
 
     return sample_predictions
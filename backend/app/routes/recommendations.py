@@ -1,4 +1,4 @@
-
+import logging
 
 from fastapi import APIRouter, Depends, HTTPException
 from supabase import Client
@@ -6,13 +6,28 @@ from typing import List
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 
+from app.config import DEMO_MODE
 from app.database import get_db
 from app.schemas import Recommendation, RecommendationCreate, RecommendationUpdate
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Explicit projection: only the columns the frontend consumes, instead
+# of select("*") dragging every column over the wire
+_RECOMMENDATION_COLUMNS = (
+    "id,location_id,risk_assessment_id,priority,category,action_title,"
+    "action_description,recommended_start_date,recommended_end_date,"
+    "urgency_hours,expected_risk_reduction,expected_cost_usd,"
+    "recommended_species,status,is_active,created_at,completed_at"
+)
+
 
-@router.get("/{location_id}", response_model=List[Recommendation])
+# No response_model here: rows coming back from Supabase are already
+# shape-stable, and re-validating every row on the way out is pure
+# per-field coercion overhead on the hottest list endpoint
+@router.get("/{location_id}")
 async def get_recommendations(
     location_id: UUID,  # ✅ changed from int → UUID
     supabase: Client = Depends(get_db)
@@ -21,21 +36,24 @@ async def get_recommendations(
     try:
         response = (
             supabase.table('recommendations')
-            .select("*")
-            .eq('location_id', str(location_id))  # ✅ Supabase expects UUID as string
+            .select(_RECOMMENDATION_COLUMNS)
+            .eq('location_id', location_id)  # postgrest-py serializes the UUID itself
             .eq('is_active', True)
             .order('priority', desc=True)
             .order('created_at', desc=True)
+            .limit(50)
             .execute()
         )
 
         if not response.data:
-            return generate_sample_recommendations(location_id)
+            return generate_sample_recommendations(location_id) if DEMO_MODE else []
 
         return response.data
-    except Exception as e:
-        print(f"Error fetching recommendations: {e}")
-        return generate_sample_recommendations(location_id)
+    except Exception:
+        logger.exception("Error fetching recommendations")
+        if DEMO_MODE:
+            return generate_sample_recommendations(location_id)
+        raise HTTPException(status_code=503, detail="Database unavailable")
 
 
 @router.post("/", response_model=Recommendation)
@@ -45,9 +63,9 @@ async def create_recommendation(
 ):
     """Create a new recommendation"""
     try:
-        # Convert UUIDs to strings before sending to Supabase
+        # Convert UUIDs to strings before sending to Supabase.
+        # id omitted: the table defaults to gen_random_uuid() server-side
         data = recommendation.model_dump()
-        data["id"] = str(uuid4())  # ✅ generate new UUID if not provided
         if "location_id" in data:
             data["location_id"] = str(data["location_id"])
 
@@ -77,7 +95,7 @@ async def update_recommendation(
         response = (
             supabase.table('recommendations')
             .update(update_data)
-            .eq('id', str(recommendation_id))  # ✅ cast UUID to string
+            .eq('id', recommendation_id)
             .execute()
         )
 
@@ -101,7 +119,7 @@ async def delete_recommendation(
         response = (
             supabase.table('recommendations')
             .delete()
-            .eq('id', str(recommendation_id))
+            .eq('id', recommendation_id)
             .execute()
         )
 
@@ -116,68 +134,80 @@ async def delete_recommendation(
 
 
 
-def generate_sample_recommendations(location_id: str) -> List[dict]:
-    """Generate sample recommendations aligned with schema (UUID-based)."""
-    now = datetime.utcnow()
-
-    return [
+# Static template built once at import: each fallback call only overlays
+# the per-call fields (id, location, dates) instead of rebuilding the
+# three literal dicts. Second tuple element is the end-date offset in days.
+_SAMPLE_RECOMMENDATIONS = (
+    (
         {
-            "id": str(uuid.uuid4()),
-            "location_id": location_id,
             "risk_assessment_id": None,
             "priority": "high",
             "category": "irrigation",
             "action_title": "Implement Water Conservation",
             "action_description": "Soil moisture levels are below optimal. Use water-efficient irrigation systems to conserve water.",
-            "recommended_start_date": now.date().isoformat(),
-            "recommended_end_date": (now + timedelta(days=14)).date().isoformat(),
             "urgency_hours": 48,
             "expected_risk_reduction": 0.35,
             "expected_cost_usd": 1200.0,
             "recommended_species": {"plants": ["Mulberry", "Vetiver grass"]},
             "status": "pending",
             "is_active": True,
-            "created_at": now.isoformat(),
             "completed_at": None,
         },
+        14,
+    ),
+    (
         {
-            "id": str(uuid.uuid4()),
-            "location_id": location_id,
             "risk_assessment_id": None,
             "priority": "medium",
             "category": "soil",
             "action_title": "Apply Lime to Adjust Soil pH",
             "action_description": "Soil tests indicate acidity. Apply agricultural lime to restore pH balance and enhance nutrient uptake.",
-            "recommended_start_date": now.date().isoformat(),
-            "recommended_end_date": (now + timedelta(days=7)).date().isoformat(),
             "urgency_hours": 72,
             "expected_risk_reduction": 0.25,
             "expected_cost_usd": 600.0,
             "recommended_species": None,
             "status": "pending",
             "is_active": True,
-            "created_at": now.isoformat(),
             "completed_at": None,
         },
+        7,
+    ),
+    (
         {
-            "id": str(uuid.uuid4()),
-            "location_id": location_id,
             "risk_assessment_id": None,
             "priority": "low",
             "category": "monitoring",
             "action_title": "Increase Vegetation Monitoring",
             "action_description": "Monitor vegetation cover biweekly to detect early signs of degradation or erosion.",
-            "recommended_start_date": now.date().isoformat(),
-            "recommended_end_date": (now + timedelta(days=30)).date().isoformat(),
             "urgency_hours": 168,
             "expected_risk_reduction": 0.15,
             "expected_cost_usd": 300.0,
             "recommended_species": None,
             "status": "pending",
             "is_active": True,
-            "created_at": now.isoformat(),
             "completed_at": None,
         },
+        30,
+    ),
+)
+
+
+def generate_sample_recommendations(location_id: str) -> List[dict]:
+    """Generate sample recommendations aligned with schema (UUID-based)."""
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    start_date = now.date().isoformat()
+
+    return [
+        {
+            **template,
+            "id": uuid4().hex,
+            "location_id": location_id,
+            "recommended_start_date": start_date,
+            "recommended_end_date": (now + timedelta(days=end_days)).date().isoformat(),
+            "created_at": now_iso,
+        }
+        for template, end_days in _SAMPLE_RECOMMENDATIONS
     ]
 
 
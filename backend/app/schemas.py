@@ -1,7 +1,7 @@
 from datetime import datetime, date
 from typing import List, Optional, Dict
 from uuid import UUID
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 
 
 # ----------------------------
@@ -32,8 +32,7 @@ class Location(LocationBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================================
@@ -55,17 +54,22 @@ class ClimateData(ClimateDataBase):
     id: UUID
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ----------------------------
 # Land Health Schemas
 # ----------------------------
 class LandHealthBase(BaseModel):
+    # The frontend speaks ndvi/vegetation_cover while the table speaks
+    # vegetation_index/soil_moisture; aliases let rows validate under
+    # either name and serialize with the frontend keys (FastAPI emits
+    # by alias), so no handler has to rename per row
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
     location_id: UUID
-    soil_moisture: float
-    vegetation_index: float
+    soil_moisture: float = Field(alias="vegetation_cover")
+    vegetation_index: float = Field(alias="ndvi")
     soil_ph: Optional[float] = None
     erosion_risk: float
     overall_health_score: float
@@ -80,8 +84,7 @@ class LandHealth(LandHealthBase):
     date: datetime
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ----------------------------
@@ -105,19 +108,12 @@ class Prediction(PredictionBase):
     prediction_date: datetime
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ----------------------------
 # Recommendation Schemas
 # ----------------------------
-from pydantic import BaseModel
-from typing import Optional, Dict
-from datetime import datetime, date
-from uuid import UUID
-
-
 class RecommendationBase(BaseModel):
     location_id: UUID
     risk_assessment_id: Optional[UUID] = None
@@ -134,7 +130,7 @@ class RecommendationBase(BaseModel):
     status: Optional[str] = "pending"
     is_active: Optional[bool] = True
 
-    model_config = {"protected_namespaces": ()}  # allows model_version-like fields elsewhere
+    model_config = ConfigDict(protected_namespaces=())  # allows model_version-like fields elsewhere
 
 
 class RecommendationCreate(RecommendationBase):
@@ -164,6 +160,16 @@ class Recommendation(RecommendationBase):
 # ----------------------------
 # Risk Assessment Schemas
 # ----------------------------
+class DegradationRisk(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: Optional[UUID] = None
+    location_id: Optional[UUID] = None
+    risk_type: str = "Unknown"
+    risk_score: Optional[float] = None
+    assessment_date: Optional[datetime] = None
+
+
 class RiskAssessmentBase(BaseModel):
     location_id: UUID
     category: str
@@ -181,8 +187,7 @@ class RiskAssessment(RiskAssessmentBase):
     date: datetime
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ----------------------------
@@ -212,8 +217,7 @@ class User(UserBase):
     created_at: datetime
     last_login: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ----------------------------
@@ -237,8 +241,7 @@ class Alert(AlertBase):
     created_at: datetime
     resolved_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ----------------------------
@@ -3,10 +3,11 @@ Weather streaming service with Supabase real-time integration
 """
 import os
 import asyncio
+import time
 import aiohttp
-from datetime import datetime
-from typing import Dict, List
-from app.database import supabase
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from app.database import get_supabase_client
 
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
 BASE_URL = "https://api.openweathermap.org/data/2.5"
@@ -14,24 +15,61 @@ BASE_URL = "https://api.openweathermap.org/data/2.5"
 
 class WeatherStreamingService:
     """Stream weather data directly to Supabase"""
-    
+
+    # One process-wide session: reusing pooled TCP/TLS connections means
+    # repeat weather calls skip the DNS lookup and handshake that
+    # otherwise dominate their latency
+    _shared_session = None
+
+    # TTL cache for current weather, keyed on coordinates rounded to
+    # ~1 km. OpenWeather itself refreshes roughly every 10 minutes, so
+    # nearby locations and back-to-back calls share one API response
+    _weather_cache: Dict[Tuple[float, float], Tuple[float, Dict]] = {}
+    _weather_cache_ttl = 600
+
     def __init__(self):
         self.api_key = OPENWEATHER_API_KEY
-        self.session = None
-    
+
+    @classmethod
+    def _session(cls) -> aiohttp.ClientSession:
+        if cls._shared_session is None or cls._shared_session.closed:
+            cls._shared_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    keepalive_timeout=75,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True,
+                ),
+                timeout=aiohttp.ClientTimeout(total=10),
+            )
+        return cls._shared_session
+
+    @classmethod
+    async def close_shared_session(cls):
+        """Close the shared session (application shutdown)"""
+        if cls._shared_session is not None and not cls._shared_session.closed:
+            await cls._shared_session.close()
+        cls._shared_session = None
+
+    # Kept for backward compatibility: the session is shared now, so the
+    # context manager no longer opens or closes anything
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
         return self
-    
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
-    
+        pass
+
     async def get_current_weather(self, lat: float, lon: float) -> Dict:
-        """Fetch current weather from API"""
+        """Fetch current weather from API (10 min TTL cache per ~1 km cell)"""
         if not self.api_key:
             return self._generate_sample_weather(lat, lon)
-        
+
+        key = (round(lat, 2), round(lon, 2))
+        cached = self._weather_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
         url = f"{BASE_URL}/weather"
         params = {
             'lat': lat,
@@ -39,12 +77,17 @@ class WeatherStreamingService:
             'appid': self.api_key,
             'units': 'metric'
         }
-        
+
         try:
-            async with self.session.get(url, params=params) as response:
+            async with self._session().get(url, params=params) as response:
                 if response.status == 200:
                     data = await response.json()
-                    return self._parse_current_weather(data)
+                    weather = self._parse_current_weather(data)
+                    self._weather_cache[key] = (
+                        time.monotonic() + self._weather_cache_ttl,
+                        weather,
+                    )
+                    return weather
                 else:
                     return self._generate_sample_weather(lat, lon)
         except Exception as e:
@@ -64,6 +107,72 @@ class WeatherStreamingService:
             'timestamp': datetime.now()
         }
     
+    async def get_forecast(self, lat: float, lon: float, days: int = 7) -> List[Dict]:
+        """Fetch daily forecast from API (3-hourly data rolled up per day)"""
+        if not self.api_key:
+            return self._generate_sample_forecast(lat, lon, days)
+
+        url = f"{BASE_URL}/forecast"
+        params = {
+            'lat': lat,
+            'lon': lon,
+            'appid': self.api_key,
+            'units': 'metric'
+        }
+
+        try:
+            async with self._session().get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return self._parse_forecast(data, days)
+                else:
+                    return self._generate_sample_forecast(lat, lon, days)
+        except Exception as e:
+            print(f"❌ Forecast API error: {e}")
+            return self._generate_sample_forecast(lat, lon, days)
+
+    def _parse_forecast(self, data: Dict, days: int) -> List[Dict]:
+        """Roll the 3-hourly forecast entries up to one row per day"""
+        daily: Dict[str, Dict] = {}
+        for entry in data.get('list', []):
+            day = entry['dt_txt'].split(' ')[0]
+            bucket = daily.setdefault(day, {
+                'date': day,
+                'temp_min': entry['main']['temp_min'],
+                'temp_max': entry['main']['temp_max'],
+                'humidity': [],
+                'precipitation': 0,
+                'description': entry['weather'][0]['description'],
+            })
+            bucket['temp_min'] = min(bucket['temp_min'], entry['main']['temp_min'])
+            bucket['temp_max'] = max(bucket['temp_max'], entry['main']['temp_max'])
+            bucket['humidity'].append(entry['main']['humidity'])
+            bucket['precipitation'] += entry.get('rain', {}).get('3h', 0)
+
+        forecast = []
+        for day in sorted(daily)[:days]:
+            bucket = daily[day]
+            bucket['humidity'] = round(sum(bucket['humidity']) / len(bucket['humidity']))
+            bucket['precipitation'] = round(bucket['precipitation'], 1)
+            forecast.append(bucket)
+        return forecast
+
+    def _generate_sample_forecast(self, lat: float, lon: float, days: int) -> List[Dict]:
+        """Fallback sample forecast"""
+        base_temp = 30 - (abs(lat) * 0.5)
+        today = datetime.now().date()
+        return [
+            {
+                'date': (today + timedelta(days=i + 1)).isoformat(),
+                'temp_min': round(base_temp - 3, 1),
+                'temp_max': round(base_temp + 5, 1),
+                'humidity': 65,
+                'precipitation': 0,
+                'description': 'Partly cloudy',
+            }
+            for i in range(days)
+        ]
+
     def _generate_sample_weather(self, lat: float, lon: float) -> Dict:
         """Fallback sample weather"""
         base_temp = 30 - (abs(lat) * 0.5)
@@ -98,7 +207,13 @@ class WeatherStreamingService:
             }
             
             # 🔥 INSERT triggers Supabase Realtime broadcast
-            response = supabase.table("climate_data").upsert(climate_data).execute()
+            # (sync PostgREST call: run in a worker thread so it doesn't
+            # block the event loop)
+            response = await asyncio.to_thread(
+                lambda: get_supabase_client().table("climate_data").upsert(
+                    climate_data, on_conflict="location_id,date"
+                ).execute()
+            )
             
             print(f"✅ Weather streamed to Supabase: {location_id} - {weather['temp_avg']}°C")
             
@@ -109,7 +224,51 @@ class WeatherStreamingService:
             
         except Exception as e:
             print(f"❌ Error streaming to Supabase: {e}")
-    
+
+    async def stream_weather_batch(self, rows: List[Tuple[str, Dict]]):
+        """Upsert one batch of (location_id, weather) pairs per cycle
+
+        One bulk upsert replaces a per-location round-trip; alert checks
+        still run per row afterwards.
+        """
+        if not rows:
+            return []
+
+        try:
+            climate_rows = [
+                {
+                    'location_id': location_id,
+                    'date': weather['timestamp'].date().isoformat(),
+                    'temp_avg': weather['temp_avg'],
+                    'temp_max': weather['temp_max'],
+                    'temp_min': weather['temp_min'],
+                    'humidity': weather['humidity'],
+                    'wind_speed': weather['wind_speed'],
+                    'precipitation': weather['precipitation'],
+                    'source': 'openweathermap',
+                    'is_forecast': False
+                }
+                for location_id, weather in rows
+            ]
+
+            # Explicit conflict target: one INSERT ... ON CONFLICT against
+            # the (location_id, date) unique index per cycle
+            response = await asyncio.to_thread(
+                lambda: get_supabase_client().table("climate_data").upsert(
+                    climate_rows, on_conflict="location_id,date"
+                ).execute()
+            )
+
+            print(f"✅ Weather streamed to Supabase: {len(climate_rows)} locations")
+
+            for location_id, weather in rows:
+                await self.check_weather_alerts(location_id, weather)
+
+            return response.data
+
+        except Exception as e:
+            print(f"❌ Error streaming batch to Supabase: {e}")
+
     async def check_weather_alerts(self, location_id: str, weather: Dict):
         """Create alerts for extreme weather"""
         
@@ -147,37 +306,51 @@ class WeatherStreamingService:
                 ]
             })
         
-        # Insert alerts (triggers realtime broadcast)
-        if alerts:
-            for alert in alerts:
-                supabase.table("alerts").insert(alert).execute()
-                print(f"🚨 Alert created: {alert['title']}")
+        if not alerts:
+            return
+
+        # One bulk insert (still triggers realtime broadcast): N alerts
+        # become a single PostgREST round-trip instead of N
+        await asyncio.to_thread(
+            lambda: get_supabase_client().table("alerts").insert(alerts).execute()
+        )
+        for alert in alerts:
+            print(f"🚨 Alert created: {alert['title']}")
     
     async def stream_all_locations(self):
         """Continuously stream weather for all locations"""
         
         print("🌤️  Starting continuous weather streaming to Supabase...")
         
+        # Bounded concurrency: overlap the weather calls instead of
+        # awaiting them one by one; 10 in flight stays well under
+        # OpenWeather's 60/min free-tier limit
+        sem = asyncio.Semaphore(10)
+
+        async def _fetch(location):
+            async with sem:
+                weather = await self.get_current_weather(
+                    location['latitude'],
+                    location['longitude']
+                )
+            return (location['id'], weather)
+
         while True:
             try:
                 # Get all locations
-                locations = supabase.table("locations").select("*").execute()
-                
+                locations = await asyncio.to_thread(
+                    lambda: get_supabase_client().table("locations").select("*").execute()
+                )
+
                 print(f"\n📍 Streaming weather for {len(locations.data)} locations...")
-                
-                for location in locations.data:
-                    # Fetch weather
-                    weather = await self.get_current_weather(
-                        location['latitude'],
-                        location['longitude']
-                    )
-                    
-                    # Stream to Supabase (triggers realtime)
-                    await self.stream_weather_to_supabase(location['id'], weather)
-                    
-                    # Small delay to avoid rate limits
-                    await asyncio.sleep(1)
-                
+
+                rows = await asyncio.gather(
+                    *[_fetch(location) for location in locations.data]
+                )
+
+                # One bulk upsert per cycle (triggers realtime)
+                await self.stream_weather_batch(rows)
+
                 print(f"\n💤 Next update in 15 minutes...")
                 await asyncio.sleep(900)  # 15 minutes
                 
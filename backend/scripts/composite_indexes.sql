@@ -0,0 +1,54 @@
+-- =========================================================
+-- 🗂️ Composite indexes for the hot per-location lookups
+-- =========================================================
+-- Every latest/forecast/list endpoint filters on location_id and
+-- orders by a date (or priority) column. These indexes turn the
+-- sort-over-scan into an index backward scan with early termination.
+-- Run in your Supabase SQL Editor. On a busy production database,
+-- run each statement via psql with CONCURRENTLY instead (it cannot
+-- run inside the editor's transaction).
+-- =========================================================
+
+CREATE INDEX IF NOT EXISTS climate_data_loc_date_desc
+    ON climate_data (location_id, date DESC);
+
+-- One reading per location per day: the weather streamer upserts with
+-- on_conflict="location_id,date", which needs this unique index to
+-- resolve to an INSERT ... ON CONFLICT path
+CREATE UNIQUE INDEX IF NOT EXISTS climate_data_loc_date_unique
+    ON climate_data (location_id, date);
+
+CREATE INDEX IF NOT EXISTS land_health_loc_obs_date_desc
+    ON land_health (location_id, observation_date DESC);
+
+CREATE INDEX IF NOT EXISTS degradation_risk_loc_assess_date_desc
+    ON degradation_risk (location_id, assessment_date DESC);
+
+CREATE INDEX IF NOT EXISTS recommendations_loc_priority_status
+    ON recommendations (location_id, priority DESC, status);
+
+-- Partial index matching the active-recommendations list exactly:
+-- filter (location_id, is_active) plus the ORDER BY columns, so the
+-- read is an ordered index scan with no Sort node (verify with
+-- EXPLAIN (ANALYZE, BUFFERS))
+CREATE INDEX IF NOT EXISTS recommendations_active_priority_created
+    ON recommendations (location_id, priority DESC, created_at DESC)
+    WHERE is_active = TRUE;
+
+-- Routes under app/routes filter land_health on date (not
+-- observation_date) and read predictions by target date and by
+-- (type, prediction date) — same top-N shape, same index treatment
+CREATE INDEX IF NOT EXISTS land_health_loc_date_desc
+    ON land_health (location_id, date DESC);
+
+-- Covering index: INCLUDE carries every column the predictions list
+-- endpoint selects, so its top-10 read is an index-only scan that never
+-- touches the heap (run ANALYZE predictions; and check EXPLAIN shows
+-- "Index Only Scan" — an unvacuumed table will still visit the heap)
+CREATE INDEX IF NOT EXISTS predictions_loc_target_date_desc
+    ON predictions (location_id, target_date DESC)
+    INCLUDE (id, prediction_type, predicted_value, confidence_score,
+             model_version, prediction_date, created_at);
+
+CREATE INDEX IF NOT EXISTS predictions_loc_type_pred_date_desc
+    ON predictions (location_id, prediction_type, prediction_date DESC);
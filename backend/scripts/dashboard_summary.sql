@@ -0,0 +1,44 @@
+-- =========================================================
+-- 📊 Dashboard summary RPC
+-- =========================================================
+-- Collapses the five dashboard queries (three counts plus the
+-- high-risk and pending-recommendation lookups) into a single
+-- Postgres function so the API pays one round-trip instead of five.
+-- Run this in your Supabase SQL Editor.
+-- =========================================================
+
+CREATE OR REPLACE FUNCTION dashboard_summary()
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+SELECT jsonb_build_object(
+    -- planner estimates from pg_class: O(1) instead of a full scan per
+    -- count, and plenty accurate for a dashboard headline number
+    'locations', (SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = 'locations'),
+    'climate', (SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = 'climate_data'),
+    'health', (SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = 'land_health'),
+    'high_risk', COALESCE((
+        SELECT jsonb_agg(r)
+        FROM (
+            -- list-card columns only; no description blobs
+            SELECT id, location_id, assessment_date, total_risk_score, risk_level
+            FROM degradation_risk
+            WHERE total_risk_score >= 50
+            ORDER BY total_risk_score DESC
+            LIMIT 5
+        ) r
+    ), '[]'::jsonb),
+    'pending', COALESCE((
+        SELECT jsonb_agg(p)
+        FROM (
+            SELECT id, location_id, priority, category, action_title,
+                   urgency_hours, status, created_at
+            FROM recommendations
+            WHERE status = 'pending'
+            ORDER BY priority DESC
+            LIMIT 10
+        ) p
+    ), '[]'::jsonb)
+);
+$$;
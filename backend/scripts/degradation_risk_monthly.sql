@@ -0,0 +1,35 @@
+-- =========================================================
+-- 📈 Monthly degradation-risk trend rollup
+-- =========================================================
+-- The trend endpoint only drives a dashboard chart, so shipping every
+-- raw assessment row (~180 for six months of daily data) to Python is
+-- wasted I/O. This pre-aggregates one row per location per month;
+-- the endpoint reads ~6 rows instead. Run in your Supabase SQL Editor.
+-- =========================================================
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS degradation_risk_monthly AS
+SELECT location_id,
+       date_trunc('month', assessment_date) AS month,
+       avg(risk_score) AS risk_score,
+       mode() WITHIN GROUP (ORDER BY risk_type) AS risk_type
+FROM degradation_risk
+GROUP BY 1, 2;
+
+-- Unique index makes REFRESH ... CONCURRENTLY possible (readers never
+-- block on the refresh)
+CREATE UNIQUE INDEX IF NOT EXISTS degradation_risk_monthly_loc_month
+    ON degradation_risk_monthly (location_id, month);
+
+CREATE OR REPLACE FUNCTION refresh_degradation_risk_monthly()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY degradation_risk_monthly;
+END;
+$$;
+
+-- Hourly refresh via pg_cron (enable the extension under
+-- Database -> Extensions first):
+-- SELECT cron.schedule('refresh-risk-monthly', '0 * * * *',
+--                      'SELECT refresh_degradation_risk_monthly()');
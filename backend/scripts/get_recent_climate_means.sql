@@ -0,0 +1,18 @@
+-- =========================================================
+-- 🌡️ Recent climate means for risk feature gathering
+-- =========================================================
+-- DegradationRiskCalculator only needs the 30-day average
+-- temperature and precipitation, not 30 raw rows. Aggregating
+-- in the database sends one row over the wire and runs the avg
+-- on the (location_id, date DESC) index (composite_indexes.sql).
+-- Run in your Supabase SQL Editor.
+-- =========================================================
+
+CREATE OR REPLACE FUNCTION get_recent_climate_means(loc UUID, days INT DEFAULT 30)
+RETURNS TABLE (avg_temp DOUBLE PRECISION, avg_precip DOUBLE PRECISION)
+LANGUAGE sql STABLE AS $$
+    SELECT avg(temperature), avg(precipitation)
+    FROM climate_data
+    WHERE location_id = loc
+      AND date >= CURRENT_DATE - days;
+$$;
@@ -0,0 +1,47 @@
+-- =========================================================
+-- ⚡ Latest-row-per-location materialized views
+-- =========================================================
+-- The "latest row per location" lookups (climate, land health,
+-- degradation risk) each force an index-ordered scan. These views
+-- keep exactly one row per location so the API reads become O(1)
+-- index lookups on tiny tables.
+-- Run this in your Supabase SQL Editor; call
+-- refresh_latest_per_location() after each ingest batch.
+-- =========================================================
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS latest_climate AS
+SELECT DISTINCT ON (location_id) *
+FROM climate_data
+ORDER BY location_id, date DESC;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_latest_climate_location
+    ON latest_climate (location_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS latest_land_health AS
+SELECT DISTINCT ON (location_id) *
+FROM land_health
+ORDER BY location_id, observation_date DESC;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_latest_land_health_location
+    ON latest_land_health (location_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS latest_risk AS
+SELECT DISTINCT ON (location_id) *
+FROM degradation_risk
+ORDER BY location_id, assessment_date DESC;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_latest_risk_location
+    ON latest_risk (location_id);
+
+-- Refresh after ingest; CONCURRENTLY keeps readers unblocked (needs
+-- the unique indexes above)
+CREATE OR REPLACE FUNCTION refresh_latest_per_location()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY latest_climate;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY latest_land_health;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY latest_risk;
+END;
+$$;
@@ -0,0 +1,38 @@
+-- =========================================================
+-- 📸 Location snapshot RPC
+-- =========================================================
+-- Returns the latest climate, land health and degradation risk
+-- rows for a location in one round-trip, so the frontend's
+-- per-location view costs one request instead of three.
+-- Run this in your Supabase SQL Editor.
+-- =========================================================
+
+CREATE OR REPLACE FUNCTION location_snapshot(loc uuid)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+SELECT jsonb_build_object(
+    'climate', (
+        SELECT row_to_json(c)
+        FROM climate_data c
+        WHERE c.location_id = loc
+        ORDER BY c.date DESC
+        LIMIT 1
+    ),
+    'health', (
+        SELECT row_to_json(h)
+        FROM land_health h
+        WHERE h.location_id = loc
+        ORDER BY h.observation_date DESC
+        LIMIT 1
+    ),
+    'risk', (
+        SELECT row_to_json(r)
+        FROM degradation_risk r
+        WHERE r.location_id = loc
+        ORDER BY r.assessment_date DESC
+        LIMIT 1
+    )
+);
+$$;
@@ -0,0 +1,34 @@
+-- =========================================================
+-- 🌍 PostGIS geography column + GiST index on locations
+-- =========================================================
+-- Spatial lookups (nearest location, radius matching for weather
+-- data) against the raw latitude/longitude float pair can only
+-- seq-scan. This adds a geography(Point) column generated from the
+-- existing columns plus a GiST index, so bounding-box pruning happens
+-- in the index. latitude/longitude stay plain writable columns — the
+-- API keeps inserting them as before and the database derives geom.
+-- Run in your Supabase SQL Editor.
+-- =========================================================
+
+CREATE EXTENSION IF NOT EXISTS postgis;
+
+ALTER TABLE locations
+    ADD COLUMN IF NOT EXISTS geom geography(Point, 4326)
+    GENERATED ALWAYS AS (
+        ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS locations_geom_idx
+    ON locations USING GIST (geom);
+
+-- SP-GiST alternative: locations cluster tightly (several per city),
+-- and SP-GiST's space partitioning stays smaller and cache-friendlier
+-- than GiST on overlapping/clustered points. SP-GiST doesn't index the
+-- geography type, hence the ::geometry expression index — queries must
+-- use the same cast to hit it, e.g.
+--   WHERE ST_DWithin(geom::geometry, ST_MakePoint($1, $2), $3)
+-- Compare both with EXPLAIN (ANALYZE, BUFFERS) on your workload and
+-- drop whichever loses:
+--   DROP INDEX IF EXISTS locations_geom_idx;
+CREATE INDEX IF NOT EXISTS locations_geom_spgist
+    ON locations USING SPGIST ((geom::geometry));